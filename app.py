@@ -1,14 +1,38 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-import json
 import os
+import queue
+import threading
 from datetime import datetime
-import tempfile
 from pathlib import Path
 
 # Import the main algorithm
-from main import main as run_candidate_elimination
+from main import LearningCancelled, format_boundaries, run as run_candidate_elimination
+from history_store import HistoryStore
+from result_cache import ResultCache
+
+# Milliseconds between two polls of the worker's message queue
+WORKER_POLL_MS = 100
+
+# Preview paging: rows read per page, and the most rows kept in the preview
+PREVIEW_PAGE_ROWS = 200
+PREVIEW_MAX_ROWS = 50000
+
+
+def estimate_row_count(file_path, sample_bytes=1 << 16):
+    """Estimate the data rows of a CSV file from a leading sample; returns (count, exact)"""
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_bytes)
+    lines = sample.count(b'\n')
+    if len(sample) >= file_size:
+        if sample and not sample.endswith(b'\n'):
+            lines += 1
+        return max(lines - 1, 0), True
+    if lines == 0:
+        return 0, False
+    average_line = len(sample) / lines
+    return max(int(file_size / average_line) - 1, 0), False
 
 
 class CandidateEliminationGUI:
@@ -21,16 +45,29 @@ class CandidateEliminationGUI:
         self.root.minsize(1000, 600)
         
         # Initialize variables
-        self.current_data = None
+        self.current_data = None  # first preview page
         self.current_file_path = None
+        self.preview_reader = None
+        self.preview_rows = 0
+        self.estimated_rows = 0
+        self.rows_exact = False
         self.positive_indicator = "Yes"
         self.negative_indicator = "No"
         self.results_history = []
         
+        # Background processing state
+        self.worker = None
+        self.worker_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        
         # Create results directory
         self.results_dir = Path("results")
         self.results_dir.mkdir(exist_ok=True)
         
+        # Results of identical jobs are reused from the cache
+        self.result_cache = ResultCache(self.results_dir / "cache")
+        self.result_from_cache = False
+        
         # Load history
         self.load_history()
         
@@ -142,7 +179,18 @@ class CandidateEliminationGUI:
         self.process_btn = ttk.Button(process_frame, text="🚀 Process Data", 
                                      command=self.process_data, style='Primary.TButton',
                                      state='disabled')
-        self.process_btn.pack()
+        self.process_btn.pack(side=tk.LEFT)
+        
+        self.cancel_btn = ttk.Button(process_frame, text="⏹ Cancel", 
+                                    command=self.cancel_processing, style='Secondary.TButton',
+                                    state='disabled')
+        self.cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Progress display
+        self.progress_bar = ttk.Progressbar(process_frame, length=200, mode='determinate')
+        self.progress_bar.pack(side=tk.LEFT, padx=(10, 0))
+        self.progress_label = ttk.Label(process_frame, text="", style='Info.TLabel')
+        self.progress_label.pack(side=tk.LEFT, padx=(10, 0))
         
         # Data preview section
         preview_section = ttk.LabelFrame(self.import_frame, text="Data Preview", padding="10")
@@ -169,9 +217,9 @@ class CandidateEliminationGUI:
         self.preview_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
-        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.preview_tree.configure(yscrollcommand=v_scrollbar.set)
+        self.preview_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.preview_tree.yview)
+        self.preview_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.preview_tree.configure(yscrollcommand=self.on_preview_scroll)
         
         h_scrollbar = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.preview_tree.xview)
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
@@ -271,33 +319,47 @@ class CandidateEliminationGUI:
             self.load_file(file_path)
     
     def load_file(self, file_path):
-        """Load and preview CSV file"""
+        """Preview the leading rows of a CSV file; the rest is paged in on scroll"""
+        # pandas is imported on first use so the window opens without it
+        import pandas as pd
         try:
-            # Load data
-            self.current_data = pd.read_csv(file_path)
+            self.close_preview_reader()
+            
+            # Read only the first page; the full file is parsed when processing
+            self.preview_reader = pd.read_csv(file_path, chunksize=PREVIEW_PAGE_ROWS,
+                                              dtype=str, keep_default_na=False)
+            self.current_data = next(self.preview_reader, None)
+            if self.current_data is None:
+                self.current_data = pd.read_csv(file_path, nrows=0)
+                self.close_preview_reader()
             self.current_file_path = file_path
+            self.estimated_rows, self.rows_exact = estimate_row_count(file_path)
             
             # Update UI
             self.file_label.config(text=f"Selected: {os.path.basename(file_path)}")
-            self.process_btn.config(state='normal')
+            self.process_btn.config(state='normal' if self.worker is None else 'disabled')
             
             # Update preview
             self.update_preview()
             
-            # Show success message
-            self.preview_info.config(text=f"✅ Loaded {len(self.current_data)} rows, {len(self.current_data.columns)} columns")
-            
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load file: {str(e)}")
+            self.close_preview_reader()
             self.current_data = None
             self.current_file_path = None
             self.process_btn.config(state='disabled')
     
+    def close_preview_reader(self):
+        """Release the file handle used for paging the preview"""
+        if self.preview_reader is not None:
+            self.preview_reader.close()
+            self.preview_reader = None
+    
     def update_preview(self):
-        """Update the data preview treeview"""
+        """Update the data preview treeview with the first page"""
         # Clear existing data
-        for item in self.preview_tree.get_children():
-            self.preview_tree.delete(item)
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_rows = 0
         
         if self.current_data is None:
             return
@@ -312,17 +374,55 @@ class CandidateEliminationGUI:
             self.preview_tree.heading(col, text=col)
             self.preview_tree.column(col, width=100, anchor='center')
         
-        # Add data (limit to first 100 rows for performance)
-        for index, row in self.current_data.head(100).iterrows():
-            values = [str(row[col]) for col in columns]
+        self.insert_preview_rows(self.current_data)
+    
+    def insert_preview_rows(self, page):
+        """Append a page of rows to the preview and refresh the row count"""
+        for values in page.to_numpy().tolist():
             self.preview_tree.insert('', 'end', values=values)
+        self.preview_rows += len(page)
+        
+        if self.preview_reader is None and self.preview_rows < PREVIEW_MAX_ROWS:
+            # Every row has been read, so the count is exact
+            self.estimated_rows, self.rows_exact = self.preview_rows, True
+        
+        columns = len(self.current_data.columns)
+        if self.rows_exact and self.preview_rows >= self.estimated_rows:
+            text = f"✅ Loaded {self.estimated_rows} rows, {columns} columns"
+        else:
+            approx = "" if self.rows_exact else "~"
+            text = (f"✅ Showing first {self.preview_rows} of {approx}{self.estimated_rows:,} rows, "
+                    f"{columns} columns (scroll to load more)")
+        self.preview_info.config(text=text)
+    
+    def on_preview_scroll(self, first, last):
+        """Scrollbar callback: page in more rows when nearing the end"""
+        self.preview_scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_preview_page()
+    
+    def load_preview_page(self):
+        """Read the next page of the file into the preview"""
+        if self.preview_reader is None:
+            return
+        if self.preview_rows >= PREVIEW_MAX_ROWS:
+            self.close_preview_reader()
+            return
+        page = next(self.preview_reader, None)
+        if page is None:
+            self.close_preview_reader()
+            page = self.current_data.iloc[0:0]
+        self.insert_preview_rows(page)
     
     def process_data(self):
         """Process the loaded data with the Candidate Elimination algorithm"""
-        if self.current_data is None:
+        if self.current_file_path is None:
             messagebox.showerror("Error", "No data loaded")
             return
         
+        if self.worker is not None:
+            return
+        
         try:
             # Get user-defined indicators
             positive_indicator = self.positive_var.get().strip()
@@ -332,57 +432,109 @@ class CandidateEliminationGUI:
                 messagebox.showerror("Error", "Please specify both positive and negative indicators")
                 return
             
-            # Validate data
-            target_column = self.current_data.columns[-1]
-            unique_targets = self.current_data[target_column].unique()
-            
-            if positive_indicator not in unique_targets:
-                messagebox.showerror("Error", f"Positive indicator '{positive_indicator}' not found in target column")
-                return
-            
-            if negative_indicator not in unique_targets:
-                messagebox.showerror("Error", f"Negative indicator '{negative_indicator}' not found in target column")
-                return
-            
-            # Convert data to algorithm format
-            processed_data = self.current_data.copy()
-            processed_data[target_column] = processed_data[target_column].replace({
-                positive_indicator: 'Yes',
-                negative_indicator: 'No'
-            })
-            
-            # Save processed data to temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
-                processed_data.to_csv(temp_file.name, index=False)
-                temp_path = temp_file.name
-            
-            # Capture algorithm output
-            import io
-            from contextlib import redirect_stdout
-            
-            output_buffer = io.StringIO()
-            
-            # Run algorithm and capture output
-            with redirect_stdout(output_buffer):
-                run_candidate_elimination(temp_path)
-            
-            algorithm_output = output_buffer.getvalue()
-            
-            # Clean up temporary file
-            os.unlink(temp_path)
-            
-            # Display results
-            self.display_results(algorithm_output, positive_indicator, negative_indicator)
-            
-            # Save to history
-            self.save_to_history(algorithm_output, positive_indicator, negative_indicator)
-            
-            # Switch to results tab
-            self.notebook.select(1)
+            # Run algorithm in a background thread; the worker parses the whole
+            # file and reports missing indicators as errors
+            self.start_worker(positive_indicator, negative_indicator)
             
         except Exception as e:
             messagebox.showerror("Error", f"Processing failed: {str(e)}")
     
+    def start_worker(self, positive_indicator, negative_indicator):
+        """Start the learning run in a worker thread and begin polling it"""
+        self.cancel_event = threading.Event()
+        self.worker_queue = queue.Queue()
+        self.result_from_cache = False
+        total_rows = self.estimated_rows if self.rows_exact else f"~{self.estimated_rows}"
+        
+        self.process_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
+        self.progress_bar.config(maximum=max(self.estimated_rows, 1), value=0)
+        self.progress_label.config(text=f"Processing 0/{total_rows} rows...")
+        
+        self.worker = threading.Thread(
+            target=self.run_worker,
+            args=(self.current_file_path, positive_indicator, negative_indicator,
+                  self.worker_queue, self.cancel_event, self.result_cache),
+            daemon=True
+        )
+        self.worker.start()
+        self.root.after(WORKER_POLL_MS, self.poll_worker, positive_indicator, negative_indicator, total_rows)
+    
+    @staticmethod
+    def run_worker(data, positive_indicator, negative_indicator, worker_queue, cancel_event,
+                   cache=None):
+        """Worker thread body: run the algorithm, or reuse a cached result, and report through the queue"""
+        def report(rows, s_size, g_size):
+            worker_queue.put(('progress', rows, s_size, g_size))
+        
+        try:
+            key = None
+            if cache is not None and isinstance(data, (str, os.PathLike)):
+                key = cache.key(data, positive_indicator, negative_indicator)
+                cached = cache.get(key)
+                if cached is not None:
+                    worker_queue.put(('cache_hit',))
+                    worker_queue.put(('done',) + cached)
+                    return
+            S, G = run_candidate_elimination(data, positive_indicator, negative_indicator,
+                                             progress=report, cancel=cancel_event)
+            if key is not None:
+                cache.put(key, S, G)
+            worker_queue.put(('done', S, G))
+        except LearningCancelled as e:
+            worker_queue.put(('cancelled', e.rows_processed))
+        except Exception as e:
+            worker_queue.put(('error', str(e)))
+    
+    def poll_worker(self, positive_indicator, negative_indicator, total_rows):
+        """Drain worker messages on the Tk thread and update the UI"""
+        try:
+            while True:
+                message = self.worker_queue.get_nowait()
+                kind = message[0]
+                
+                if kind == 'progress':
+                    rows, s_size, g_size = message[1:]
+                    self.progress_bar.config(value=rows)
+                    self.progress_label.config(
+                        text=f"Processed {rows}/{total_rows} rows  |S| = {s_size}  |G| = {g_size}")
+                    continue
+                if kind == 'cache_hit':
+                    self.result_from_cache = True
+                    continue
+                
+                self.finish_worker()
+                if kind == 'done':
+                    algorithm_output = format_boundaries(message[1], message[2])
+                    self.progress_label.config(text="✅ Loaded from cache" if self.result_from_cache
+                                               else "✅ Processing complete")
+                    self.display_results(algorithm_output, positive_indicator, negative_indicator)
+                    self.save_to_history(algorithm_output, positive_indicator, negative_indicator)
+                    self.notebook.select(1)
+                elif kind == 'cancelled':
+                    self.progress_label.config(text=f"⏹ Cancelled after {message[1]} rows")
+                else:
+                    self.progress_label.config(text="")
+                    messagebox.showerror("Error", f"Processing failed: {message[1]}")
+                return
+        except queue.Empty:
+            pass
+        
+        self.root.after(WORKER_POLL_MS, self.poll_worker, positive_indicator, negative_indicator, total_rows)
+    
+    def finish_worker(self):
+        """Reset the controls once the worker has stopped"""
+        self.worker = None
+        self.process_btn.config(state='normal' if self.current_file_path is not None else 'disabled')
+        self.cancel_btn.config(state='disabled')
+    
+    def cancel_processing(self):
+        """Ask the running worker to stop"""
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.cancel_btn.config(state='disabled')
+            self.progress_label.config(text="Cancelling...")
+    
     def display_results(self, algorithm_output, positive_indicator, negative_indicator):
         """Display the algorithm results in a formatted way"""
         self.results_text.delete(1.0, tk.END)
@@ -456,37 +608,34 @@ class CandidateEliminationGUI:
             'display_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         
-        self.results_history.append(history_entry)
-        self.save_history()
-        self.update_history_display()
+        try:
+            meta = self.history_store.append(history_entry)
+        except Exception as e:
+            print(f"Failed to save history: {e}")
+            return
+        
+        # Only metadata is kept in memory; newest entries are shown first
+        self.results_history.append(meta)
+        self.history_listbox.insert(0, self.history_display_text(meta))
     
     def load_history(self):
-        """Load processing history from file"""
-        history_file = self.results_dir / "history.json"
+        """Load processing history metadata; outputs are read on demand"""
+        self.history_store = HistoryStore(self.results_dir)
         try:
-            if history_file.exists():
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    self.results_history = json.load(f)
-            else:
-                self.results_history = []
+            self.results_history = self.history_store.load()
         except Exception:
             self.results_history = []
     
-    def save_history(self):
-        """Save processing history to file"""
-        history_file = self.results_dir / "history.json"
-        try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.results_history, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Failed to save history: {e}")
+    @staticmethod
+    def history_display_text(entry):
+        """Format a history entry for the listbox"""
+        return f"{entry['display_timestamp']} - {entry['file_name']} ({entry['positive_indicator']}/{entry['negative_indicator']})"
     
     def update_history_display(self):
         """Update the history listbox"""
         self.history_listbox.delete(0, tk.END)
         for entry in reversed(self.results_history):  # Show newest first
-            display_text = f"{entry['display_timestamp']} - {entry['file_name']} ({entry['positive_indicator']}/{entry['negative_indicator']})"
-            self.history_listbox.insert(tk.END, display_text)
+            self.history_listbox.insert(tk.END, self.history_display_text(entry))
     
     def load_from_history(self, event):
         """Load results from history when double-clicked"""
@@ -498,6 +647,13 @@ class CandidateEliminationGUI:
         index = len(self.results_history) - 1 - selection[0]
         entry = self.results_history[index]
         
+        # Fetch the full output only now
+        try:
+            entry = dict(entry, output=self.history_store.read_output(entry))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read history entry: {str(e)}")
+            return
+        
         # Display the historical results
         self.display_historical_results(entry)
         self.notebook.select(1)  # Switch to results tab
@@ -530,7 +686,7 @@ class CandidateEliminationGUI:
         """Clear all processing history"""
         if messagebox.askyesno("Confirm", "Are you sure you want to clear all history?"):
             self.results_history = []
-            self.save_history()
+            self.history_store.clear()
             self.update_history_display()
             messagebox.showinfo("Success", "History cleared successfully")
 
@@ -0,0 +1,202 @@
+"""
+Batch runner: learns one version space per CSV file across a process pool.
+
+Usage:
+
+    python batch.py data_dir/ --output results/batch
+    python batch.py manifest.json --workers 8
+
+A manifest is either a JSON list of objects or a CSV file, each entry giving
+``path`` and optionally ``positive`` / ``negative`` indicators. Relative paths
+are resolved against the manifest's directory. Every dataset gets its own
+JSON result file, and ``summary.json`` records status and timing per file.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from main import run
+
+SUMMARY_FILE = 'summary.json'
+
+
+def discover_jobs(directory, positive='Yes', negative='No'):
+    """
+    Lists one job per CSV file in a directory.
+
+    Args:
+        directory (str): The directory to scan.
+        positive: The positive indicator used for every file.
+        negative: The negative indicator used for every file.
+
+    Returns:
+        list: Job dicts with 'path', 'positive' and 'negative' keys.
+    """
+    return [{'path': str(path), 'positive': positive, 'negative': negative}
+            for path in sorted(Path(directory).glob('*.csv'))]
+
+
+def read_manifest(manifest_path, positive='Yes', negative='No'):
+    """
+    Reads jobs from a JSON or CSV manifest.
+
+    Args:
+        manifest_path (str): The manifest file.
+        positive: Default positive indicator for entries without one.
+        negative: Default negative indicator for entries without one.
+
+    Returns:
+        list: Job dicts with 'path', 'positive' and 'negative' keys.
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        if manifest_path.suffix.lower() == '.json':
+            entries = json.load(f)
+        else:
+            entries = list(csv.DictReader(f))
+    jobs = []
+    for entry in entries:
+        path = Path(entry['path'])
+        if not path.is_absolute():
+            path = manifest_path.parent / path
+        jobs.append({
+            'path': str(path),
+            'positive': entry.get('positive') or positive,
+            'negative': entry.get('negative') or negative,
+        })
+    return jobs
+
+
+def run_job(job):
+    """
+    Learns the version space of a single dataset.
+
+    Args:
+        job (dict): A job from discover_jobs or read_manifest.
+
+    Returns:
+        dict: The job, its status ('ok' or 'error'), S and G or the error
+              message, and the elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    result = dict(job)
+    try:
+        S, G = run(job['path'], job['positive'], job['negative'])
+        result.update(status='ok', S=S, G=G)
+    except Exception as e:
+        result.update(status='error', error=str(e))
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _result_names(jobs):
+    """
+    Gives each job a unique result file name based on its dataset name.
+
+    The name of the summary file is reserved, so a dataset called
+    summary.csv gets summary_2.json.
+    """
+    names = []
+    seen = {Path(SUMMARY_FILE).stem}
+    for job in jobs:
+        stem = Path(job['path']).stem
+        name = stem
+        suffix = 1
+        while name in seen:
+            suffix += 1
+            name = f"{stem}_{suffix}"
+        seen.add(name)
+        names.append(f"{name}.json")
+    return names
+
+
+def run_batch(jobs, output_dir, workers=None):
+    """
+    Runs jobs across a process pool and writes their results.
+
+    Larger files are submitted first so that no worker is left with a big
+    file at the end of the run.
+
+    Args:
+        jobs (list): Job dicts from discover_jobs or read_manifest.
+        output_dir (str): Directory receiving one JSON file per dataset and
+            summary.json.
+        workers (int, optional): Number of worker processes; defaults to
+            the number of CPUs.
+
+    Returns:
+        dict: The summary written to summary.json.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = _result_names(jobs)
+    order = sorted(range(len(jobs)), key=lambda i: -_file_size(jobs[i]['path']))
+    files = [None] * len(jobs)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, jobs[i]): i for i in order}
+        for future in as_completed(futures):
+            i = futures[future]
+            result = future.result()
+            with open(output_dir / names[i], 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+            files[i] = {
+                'path': result['path'],
+                'result': names[i],
+                'status': result['status'],
+                'seconds': round(result['seconds'], 6),
+                'S_size': len(result.get('S', [])),
+                'G_size': len(result.get('G', [])),
+            }
+            if result['status'] == 'error':
+                files[i]['error'] = result['error']
+    summary = {
+        'datasets': len(jobs),
+        'succeeded': sum(entry['status'] == 'ok' for entry in files),
+        'failed': sum(entry['status'] == 'error' for entry in files),
+        'workers': workers or os.cpu_count(),
+        'wall_seconds': round(time.perf_counter() - start, 6),
+        'cpu_seconds': round(sum(entry['seconds'] for entry in files), 6),
+        'files': files,
+    }
+    with open(output_dir / SUMMARY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def _file_size(path):
+    """Returns the size of a file, or 0 if it cannot be read."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('source', help="Directory of CSV files, or a .json/.csv manifest")
+    parser.add_argument('--output', default=os.path.join('results', 'batch'),
+                        help="Output directory (default: results/batch)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--positive', default='Yes', help="Default positive indicator")
+    parser.add_argument('--negative', default='No', help="Default negative indicator")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.source):
+        jobs = discover_jobs(args.source, args.positive, args.negative)
+    else:
+        jobs = read_manifest(args.source, args.positive, args.negative)
+    summary = run_batch(jobs, args.output, args.workers)
+    print(f"{summary['succeeded']}/{summary['datasets']} datasets processed "
+          f"in {summary['wall_seconds']:.2f} s ({summary['cpu_seconds']:.2f} s in workers)")
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,446 @@
+"""
+Benchmarks for the Candidate Elimination learner.
+
+Run from the repository root, e.g.:
+
+    python benchmark.py rows --rows 1000000
+    python benchmark.py pruning --attributes 12 --cardinality 6
+    python benchmark.py bitset --attributes 12 --cardinality 6
+    python benchmark.py suite --output results/benchmarks/suite.json
+    python benchmark.py compare results/benchmarks/old.json results/benchmarks/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+import bitset
+import encoded
+import main
+from main import extract_examples, is_more_general, learn, load_data, trait_row
+
+# Synthetic datasets run by the suite benchmark. Each is learned from a CSV
+# file through load_data, so the timings cover the whole pipeline.
+SUITE = [
+    {'name': 'baseline', 'rows': 100_000, 'attributes': 6, 'cardinality': 3,
+     'positive_ratio': 0.25, 'noise': 0.0},
+    {'name': 'wide', 'rows': 100_000, 'attributes': 20, 'cardinality': 3,
+     'positive_ratio': 0.25, 'noise': 0.0},
+    {'name': 'high_cardinality', 'rows': 100_000, 'attributes': 6, 'cardinality': 50,
+     'positive_ratio': 0.25, 'noise': 0.0},
+    {'name': 'imbalanced', 'rows': 100_000, 'attributes': 6, 'cardinality': 3,
+     'positive_ratio': 0.02, 'noise': 0.0},
+    {'name': 'noisy', 'rows': 100_000, 'attributes': 6, 'cardinality': 3,
+     'positive_ratio': 0.25, 'noise': 0.01},
+]
+STAGES = ('load', 'encode', 'learn', 'prune')
+
+
+def make_synthetic_dataset(n_rows, n_attributes=6, cardinality=3, seed=0,
+                           positive_ratio=None, noise=0.0):
+    """
+    Generates a categorical dataset labelled by a conjunctive target concept.
+
+    The label is 'Yes' exactly when the first two attributes take their first
+    value. Without noise the data is consistent with that concept, so the
+    version space never collapses.
+
+    Args:
+        n_rows (int): Number of rows.
+        n_attributes (int): Number of feature columns.
+        cardinality (int): Number of distinct values per feature.
+        seed (int): Random seed.
+        positive_ratio (float, optional): Fraction of rows drawn inside the
+            target concept; by default rows are drawn uniformly, giving
+            about 1 / cardinality ** 2 positives.
+        noise (float): Probability of flipping each label.
+
+    Returns:
+        pandas.DataFrame: The dataset, with the target as the last column.
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for i in range(n_attributes):
+        domain = [f"a{i}v{j}" for j in range(cardinality)]
+        columns[f"attr{i}"] = [rng.choice(domain) for _ in range(n_rows)]
+    concept = [column for column in ("attr0", "attr1") if column in columns]
+    if positive_ratio is not None:
+        if cardinality < 2:
+            raise ValueError("positive_ratio needs a cardinality of at least 2")
+        # Redraw the concept attributes so each row lands inside or outside
+        # the concept with the requested probability.
+        inside_values = [f"a{i}v0" for i in range(len(concept))]
+        for r in range(n_rows):
+            if rng.random() < positive_ratio:
+                values = inside_values
+            else:
+                values = inside_values
+                while values == inside_values:
+                    values = [f"a{i}v{rng.randrange(cardinality)}" for i in range(len(concept))]
+            for column, value in zip(concept, values):
+                columns[column][r] = value
+    second = columns.get("attr1", ["a1v0"] * n_rows)
+    columns["target"] = ["Yes" if (a, b) == ("a0v0", "a1v0") else "No"
+                         for a, b in zip(columns["attr0"], second)]
+    if noise:
+        flip = {"Yes": "No", "No": "Yes"}
+        columns["target"] = [flip[label] if rng.random() < noise else label
+                             for label in columns["target"]]
+    return pd.DataFrame(columns)
+
+
+def _initial_state(df):
+    """Returns unique values, S0 and G0 for a DataFrame, as load_data does."""
+    unique_values = [df[column].unique().tolist() for column in df.columns]
+    return unique_values, [[None] * (len(unique_values) - 1)], [['?'] * (len(unique_values) - 1)]
+
+
+def bench_iterrows(df):
+    """Times the original df.iterrows() / trait_row training loop."""
+    unique_values, S, G = _initial_state(df)
+    start = time.perf_counter()
+    for index, row in df.iterrows():
+        trait_row(row, S, G, unique_values)
+    return time.perf_counter() - start, S, G
+
+
+def bench_row_stream(df):
+    """Times the pre-extracted row stream training loop, extraction included."""
+    unique_values, S, G = _initial_state(df)
+    start = time.perf_counter()
+    learn(extract_examples(df), S, G, unique_values)
+    return time.perf_counter() - start, S, G
+
+
+def run_row_stream_benchmark(n_rows, n_attributes=6, cardinality=3):
+    """
+    Compares rows per second of the iterrows loop and the row stream.
+
+    Args:
+        n_rows (int): Number of synthetic rows.
+        n_attributes (int): Number of feature columns.
+        cardinality (int): Number of distinct values per feature.
+    """
+    df = make_synthetic_dataset(n_rows, n_attributes, cardinality)
+    before, S_before, G_before = bench_iterrows(df)
+    after, S_after, G_after = bench_row_stream(df)
+    if (S_before, G_before) != (S_after, G_after):
+        raise RuntimeError("Row stream learned a different version space")
+    print(f"Rows: {n_rows}, attributes: {n_attributes}, cardinality: {cardinality}")
+    print(f"{'iterrows + trait_row':<24}{before:>10.2f} s{n_rows / before:>14,.0f} rows/s")
+    print(f"{'row stream + learn':<24}{after:>10.2f} s{n_rows / after:>14,.0f} rows/s")
+    print(f"Speedup: {before / after:.1f}x")
+
+
+def pairwise_remove_less_general(G):
+    """The original all-pairs pruning of G, kept as the benchmark baseline."""
+    return [g for g in G if not any(is_more_general(g1, g) and g1 != g for g1 in G)]
+
+
+def run_pruning_benchmark(n_attributes=12, cardinality=6, max_negatives=6, seed=0):
+    """
+    Compares all-pairs and indexed pruning of G as it grows.
+
+    Negative examples seen before any positive one keep S at S0, so every
+    specialization survives and G grows with each negative. For each step the
+    same negative example is learned once with each pruning implementation.
+
+    Args:
+        n_attributes (int): Number of features.
+        cardinality (int): Number of distinct values per feature.
+        max_negatives (int): Number of negative examples to learn.
+        seed (int): Random seed.
+    """
+    rng = random.Random(seed)
+    unique_values = [[f"a{i}v{j}" for j in range(cardinality)] for i in range(n_attributes)]
+    S, G = main.make_boundary([[None] * n_attributes]), main.make_boundary([['?'] * n_attributes])
+    indexed_remove_less_general = main.remove_less_general
+    print(f"Attributes: {n_attributes}, cardinality: {cardinality}")
+    print(f"{'|G| before':>10}{'|G| after':>11}{'all-pairs':>12}{'indexed':>12}{'speedup':>10}")
+    for _ in range(max_negatives):
+        row = [rng.choice(values) for values in unique_values]
+        timings = []
+        for remove_less_general in (pairwise_remove_less_general, indexed_remove_less_general):
+            S_run, G_run = dict(S), dict(G)
+            main.remove_less_general = remove_less_general
+            try:
+                start = time.perf_counter()
+                main.trait_negative_hypothesis(row, S_run, G_run, unique_values)
+                timings.append(time.perf_counter() - start)
+            finally:
+                main.remove_less_general = indexed_remove_less_general
+        print(f"{len(G):>10}{len(G_run):>11}{timings[0]:>11.3f}s{timings[1]:>11.3f}s{timings[0] / timings[1]:>9.1f}x")
+        S, G = S_run, G_run
+
+
+def run_bitset_benchmark(n_attributes=12, cardinality=6, max_negatives=4, n_rows=50_000, seed=0):
+    """
+    Compares the bitset engine with main.py on pruning and on learning.
+
+    G is grown with negative examples as in run_pruning_benchmark. For each
+    step both engines learn the same negative example, and both
+    remove_less_general functions prune the same candidates (the members of
+    G that exclude the example plus the specializations of the others).
+    Then a synthetic dataset is learned with each engine.
+
+    Args:
+        n_attributes (int): Number of features.
+        cardinality (int): Number of distinct values per feature.
+        max_negatives (int): Number of negative examples to learn.
+        n_rows (int): Number of rows of the learned dataset.
+        seed (int): Random seed.
+
+    Raises:
+        RuntimeError: If the engines disagree.
+    """
+    rng = random.Random(seed)
+    unique_values = [[f"a{i}v{j}" for j in range(cardinality)] for i in range(n_attributes)]
+    codebooks = encoded.build_codebooks(unique_values)
+    layout = bitset.build_layout(unique_values)
+
+    def pack(h):
+        return bitset.encode_hypothesis(h, codebooks, layout)
+
+    S, G = main.make_boundary([[None] * n_attributes]), main.make_boundary([['?'] * n_attributes])
+    print(f"Attributes: {n_attributes}, cardinality: {cardinality}")
+    print(f"{'|G| before':>10}{'|G| after':>11}{'main update':>14}{'bitset update':>15}"
+          f"{'main prune':>12}{'bitset prune':>14}{'speedup':>9}")
+    for _ in range(max_negatives):
+        row = [rng.choice(values) for values in unique_values]
+        x = pack(row)
+        candidates = [g for g in G if not main.is_consistent(g, row)]
+        for g in G:
+            if main.is_consistent(g, row):
+                candidates.extend(main.iter_minimal_specializations(g, row, unique_values, S))
+        candidates = list(dict.fromkeys(candidates))
+        packed = [pack(g) for g in candidates]
+        start = time.perf_counter()
+        pruned = main.remove_less_general(candidates)
+        main_prune = time.perf_counter() - start
+        start = time.perf_counter()
+        packed_pruned = bitset.remove_less_general(packed, layout)
+        bitset_prune = time.perf_counter() - start
+
+        S_bits, G_bits = [pack(s) for s in S], {g: bitset.wildcards(g, layout) for g in map(pack, G)}
+        size = len(G)
+        start = time.perf_counter()
+        main.trait_negative_hypothesis(row, S, G, unique_values)
+        main_update = time.perf_counter() - start
+        start = time.perf_counter()
+        bitset.trait_negative_hypothesis(x, S_bits, G_bits, layout)
+        bitset_update = time.perf_counter() - start
+        if [pack(g) for g in G] != list(G_bits) or [pack(g) for g in pruned] != packed_pruned:
+            raise RuntimeError("The bitset engine learned a different G")
+        print(f"{size:>10}{len(G):>11}{main_update:>13.3f}s{bitset_update:>14.3f}s"
+              f"{main_prune:>11.3f}s{bitset_prune:>13.3f}s{main_prune / bitset_prune:>8.1f}x")
+
+    df = make_synthetic_dataset(n_rows, n_attributes, cardinality, seed, positive_ratio=0.25)
+    examples, feature_values, layout, S_bits, G_bits = bitset.load_data(df)
+    df, unique_values, S, G = load_data(df)
+    rows = list(extract_examples(df))
+    start = time.perf_counter()
+    learn(rows, S, G, unique_values[:-1])
+    main_learn = time.perf_counter() - start
+    start = time.perf_counter()
+    bitset.learn(examples, S_bits, G_bits, layout)
+    bitset_learn = time.perf_counter() - start
+    if ([bitset.decode_hypothesis(s, feature_values, layout) for s in S_bits],
+            [bitset.decode_hypothesis(g, feature_values, layout) for g in G_bits]) != (S, G):
+        raise RuntimeError("The bitset engine learned a different version space")
+    print(f"Learning {n_rows} rows: main {main_learn:.3f} s, bitset {bitset_learn:.3f} s, "
+          f"speedup {main_learn / bitset_learn:.1f}x")
+
+
+def _timed(function, totals, stage):
+    """Wraps a function so its run time is added to totals[stage]."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            totals[stage] += time.perf_counter() - start
+    return wrapper
+
+
+def run_pipeline(data_path):
+    """
+    Learns a CSV file stage by stage and times each stage.
+
+    Pruning runs inside learning, so main's pruning functions are wrapped for
+    the run and their time is reported as 'prune' and left out of 'learn'.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        tuple: Seconds per stage, and the learned S and G.
+    """
+    seconds = dict.fromkeys(STAGES, 0.0)
+    start = time.perf_counter()
+    df, unique_values, S, G = load_data(data_path, engine='pandas')
+    seconds['load'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    examples = list(extract_examples(df))
+    seconds['encode'] = time.perf_counter() - start
+
+    originals = main.remove_less_general, main.remove_more_general
+    main.remove_less_general = _timed(originals[0], seconds, 'prune')
+    main.remove_more_general = _timed(originals[1], seconds, 'prune')
+    try:
+        start = time.perf_counter()
+        learn(examples, S, G, unique_values)
+        seconds['learn'] = time.perf_counter() - start - seconds['prune']
+    finally:
+        main.remove_less_general, main.remove_more_general = originals
+    return seconds, S, G
+
+
+def measure_peak_memory(data_path):
+    """
+    Measures the peak memory allocated by each stage with tracemalloc.
+
+    Tracing slows Python down considerably, so this runs as a separate pass
+    from the timed one.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        dict: Peak traced megabytes per stage; pruning is included in 'learn'.
+    """
+    peaks = {}
+    tracemalloc.start()
+    try:
+        df, unique_values, S, G = load_data(data_path, engine='pandas')
+        peaks['load'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        examples = list(extract_examples(df))
+        peaks['encode'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        learn(examples, S, G, unique_values)
+        peaks['learn'] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {stage: round(peak / 2 ** 20, 3) for stage, peak in peaks.items()}
+
+
+def run_suite(configs=SUITE, output=None, seed=0):
+    """
+    Runs the suite of synthetic datasets and saves the results.
+
+    Args:
+        configs (list): Dataset settings, as in SUITE.
+        output (str, optional): JSON file receiving the results; defaults to
+            a timestamped file under results/benchmarks.
+        seed (int): Random seed of the generated datasets.
+
+    Returns:
+        dict: The saved report.
+    """
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for config in configs:
+            df = make_synthetic_dataset(config['rows'], config['attributes'], config['cardinality'],
+                                        seed, config['positive_ratio'], config['noise'])
+            data_path = os.path.join(tmp, f"{config['name']}.csv")
+            df.to_csv(data_path, index=False)
+            del df
+            seconds, S, G = run_pipeline(data_path)
+            total = sum(seconds.values())
+            run = dict(config)
+            run.update(
+                seconds={stage: round(value, 6) for stage, value in seconds.items()},
+                total_seconds=round(total, 6),
+                rows_per_second=round(config['rows'] / total, 1),
+                peak_memory_mb=measure_peak_memory(data_path),
+                S_size=len(S),
+                G_size=len(G),
+            )
+            runs.append(run)
+            print(f"{config['name']:<18}" + "".join(f"{seconds[stage]:>9.3f}s" for stage in STAGES)
+                  + f"{max(run['peak_memory_mb'].values()):>10.1f} MB  |S|={len(S)} |G|={len(G)}")
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'algorithm_version': main.ALGORITHM_VERSION,
+        'python': platform.python_version(),
+        'seed': seed,
+        'runs': runs,
+    }
+    if output is None:
+        output = os.path.join('results', 'benchmarks',
+                              f"suite_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved to {output}")
+    return report
+
+
+def compare_reports(old_path, new_path):
+    """
+    Prints the per-stage time ratio of two saved suite reports.
+
+    Args:
+        old_path (str): The baseline report.
+        new_path (str): The report to compare against it.
+    """
+    with open(old_path, 'r', encoding='utf-8') as f:
+        old = {run['name']: run for run in json.load(f)['runs']}
+    with open(new_path, 'r', encoding='utf-8') as f:
+        new = json.load(f)['runs']
+    print("Baseline / new, above 1.00x means the new run is faster or smaller")
+    print(f"{'dataset':<18}" + "".join(f"{stage:>10}" for stage in (*STAGES, 'total', 'memory')))
+    for run in new:
+        before = old.get(run['name'])
+        if before is None:
+            continue
+        ratios = [before['seconds'][stage] / max(run['seconds'][stage], 1e-9) for stage in STAGES]
+        ratios.append(before['total_seconds'] / max(run['total_seconds'], 1e-9))
+        ratios.append(max(before['peak_memory_mb'].values()) / max(max(run['peak_memory_mb'].values()), 1e-9))
+        print(f"{run['name']:<18}" + "".join(f"{ratio:>9.2f}x" for ratio in ratios))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmark', nargs='?', choices=['rows', 'pruning', 'bitset', 'suite', 'compare'],
+                        default='rows')
+    parser.add_argument('reports', nargs='*', help="compare: baseline and new suite reports")
+    parser.add_argument('--rows', type=int, default=None,
+                        help="Rows (default: 1000000 for rows, each dataset's own for suite)")
+    parser.add_argument('--attributes', type=int, default=6)
+    parser.add_argument('--cardinality', type=int, default=3)
+    parser.add_argument('--negatives', type=int, default=6)
+    parser.add_argument('--positive-ratio', type=float, default=None,
+                        help="suite: run one custom dataset with this positive ratio")
+    parser.add_argument('--noise', type=float, default=None,
+                        help="suite: run one custom dataset with this label noise")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="suite: report file")
+    args = parser.parse_args()
+    if args.benchmark == 'rows':
+        run_row_stream_benchmark(args.rows or 1_000_000, args.attributes, args.cardinality)
+    elif args.benchmark == 'pruning':
+        run_pruning_benchmark(args.attributes, args.cardinality, args.negatives)
+    elif args.benchmark == 'bitset':
+        run_bitset_benchmark(args.attributes, args.cardinality, args.negatives, args.rows or 50_000,
+                             args.seed)
+    elif args.benchmark == 'suite':
+        if args.positive_ratio is not None or args.noise is not None:
+            configs = [{'name': 'custom', 'rows': args.rows or 100_000,
+                        'attributes': args.attributes, 'cardinality': args.cardinality,
+                        'positive_ratio': args.positive_ratio, 'noise': args.noise or 0.0}]
+        else:
+            configs = [dict(config, rows=args.rows or config['rows']) for config in SUITE]
+        run_suite(configs, args.output, args.seed)
+    else:
+        if len(args.reports) != 2:
+            parser.error("compare needs a baseline and a new report")
+        compare_reports(*args.reports)
@@ -0,0 +1,432 @@
+"""
+Bitset Candidate Elimination engine.
+
+A hypothesis is packed into a single Python int: attribute i owns a field of
+len(unique_values[i]) + 1 bits, where '?' sets every bit of the field, None
+sets none, and a specific value sets the bit at its index in the domain. The
+top bit of a field is only ever set by '?', so '?' stays distinct from the
+value of a single-valued attribute, as it is in main.py. Examples are
+encoded the same way (one bit per field), so:
+
+- h covers x          <=>  x & ~h == 0
+- h1 more general h2  <=>  h2 & ~h1 == 0 and h1 != h2
+
+Between two hypotheses, main.py's is_consistent is not the subset test: a
+'?' on either side matches anything. A negative example keeps the
+specializations that pass main.py's ``is_consistent(h, s) or
+is_more_general(h, s)`` check against some member of S; see
+is_consistent_hypothesis. The boundaries match those of main.py.
+
+While learning, G is a dict mapping each member to its wildcards, which are
+computed once per hypothesis. The values a negative example may give to the
+'?' fields of a member are then worked out from S with a few integer
+operations per member of S, as main.iter_minimal_specializations does with
+tuples, and G is pruned by bucketing its members on their lowest value bit
+instead of comparing every pair. ``python benchmark.py bitset`` compares
+this engine with main.py.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+
+import encoded
+
+
+def build_layout(unique_values):
+    """
+    Computes the bit field of each attribute.
+
+    Args:
+        unique_values (list): List of unique values for each attribute.
+
+    Returns:
+        list: One (shift, mask) pair per attribute, where mask has every bit
+              of the attribute's field set.
+    """
+    layout = []
+    shift = 0
+    for values in unique_values:
+        width = len(values) + 1
+        layout.append((shift, ((1 << width) - 1) << shift))
+        shift += width
+    return layout
+
+
+def encode_hypothesis(h, codebooks, layout):
+    """
+    Packs a list-based hypothesis into an int.
+
+    Args:
+        h (list): The hypothesis, using '?' and None as in main.py.
+        codebooks (list): Value-to-code mappings from encoded.build_codebooks.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        int: The packed hypothesis.
+    """
+    bits = 0
+    for v, book, (shift, mask) in zip(h, codebooks, layout):
+        if v == '?':
+            bits |= mask
+        elif v is not None:
+            bits |= 1 << (shift + book[v])
+    return bits
+
+
+def decode_hypothesis(h, unique_values, layout):
+    """
+    Unpacks an int into a list-based hypothesis.
+
+    Args:
+        h (int): The packed hypothesis.
+        unique_values (list): List of unique values for each attribute.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        list: The hypothesis, using '?' and None as in main.py.
+    """
+    hypothesis = []
+    for values, (shift, mask) in zip(unique_values, layout):
+        field = h & mask
+        if field == mask:
+            hypothesis.append('?')
+        elif field == 0:
+            hypothesis.append(None)
+        else:
+            hypothesis.append(values[(field >> shift).bit_length() - 1])
+    return hypothesis
+
+
+def load_data(data_path):
+    """
+    Loads a CSV file like main.load_data and packs it for this engine.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        tuple: The packed examples, unique values per feature, the bit layout,
+               and the packed initial hypotheses S0 and G0.
+    """
+    examples, unique_values, codebooks, S, G = encoded.load_data(data_path)
+    feature_values = unique_values[:-1]
+    layout = build_layout(feature_values)
+    examples = [(pack_codes(x, layout), positive) for x, positive in examples]
+    full = 0
+    for shift, mask in layout:
+        full |= mask
+    return examples, feature_values, layout, [0], [full]
+
+
+def pack_codes(x, layout):
+    """
+    Packs an example encoded by the integer engine into an int.
+
+    Args:
+        x (tuple): The example as a tuple of value codes.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        int: The packed example.
+    """
+    bits = 0
+    for code, (shift, mask) in zip(x, layout):
+        bits |= 1 << (shift + code)
+    return bits
+
+
+def is_consistent(h, x):
+    """
+    Checks if a packed hypothesis covers a packed example.
+
+    Args:
+        h (int): The hypothesis.
+        x (int): The example.
+
+    Returns:
+        bool: True if the hypothesis covers the example, False otherwise.
+    """
+    return x & ~h == 0
+
+
+def wildcards(h, layout):
+    """
+    Selects the fields of a packed hypothesis that are '?'.
+
+    Args:
+        h (int): The hypothesis.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        int: The masks of the '?' fields of h, combined.
+    """
+    bits = 0
+    for shift, mask in layout:
+        if h & mask == mask:
+            bits |= mask
+    return bits
+
+
+def is_consistent_hypothesis(h1, h2, wildcards1, wildcards2):
+    """
+    Checks two packed hypotheses with main.py's is_consistent.
+
+    Every attribute must hold the same value in both, or '?' in either.
+
+    Args:
+        h1 (int): The first hypothesis.
+        h2 (int): The second hypothesis.
+        wildcards1 (int): wildcards(h1, layout).
+        wildcards2 (int): wildcards(h2, layout).
+
+    Returns:
+        bool: True if the hypotheses are consistent, False otherwise.
+    """
+    return (h1 ^ h2) & ~(wildcards1 | wildcards2) == 0
+
+
+def is_more_general(h1, h2):
+    """
+    Checks if packed hypothesis h1 is strictly more general than h2.
+
+    Args:
+        h1 (int): The first hypothesis.
+        h2 (int): The second hypothesis.
+
+    Returns:
+        bool: True if h1 is more general than h2, False otherwise.
+    """
+    return h1 != h2 and h2 & ~h1 == 0
+
+
+def get_minimal_generalizations(h, x, layout):
+    """
+    Computes the minimal generalization of a packed hypothesis given an example.
+
+    Args:
+        h (int): The hypothesis.
+        x (int): The example.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        list: A list containing the minimal generalization of h with respect to x.
+    """
+    if h == 0:
+        return [x]
+    generalization = h | x
+    for shift, mask in layout:
+        field = generalization & mask
+        if field & (field - 1):
+            # Two distinct values in one field can only be covered by '?'.
+            generalization |= mask
+    return [generalization]
+
+
+def get_minimal_specializations(h, x, layout):
+    """
+    Computes the minimal specializations of a packed hypothesis given an example.
+
+    Args:
+        h (int): The hypothesis.
+        x (int): The example.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        list: A list of minimal specializations of h with respect to x.
+    """
+    list_of_specializations = []
+    for shift, mask in layout:
+        if h & mask == mask:
+            rest = h & ~mask
+            excluded = x & mask
+            values = mask & (mask >> 1)
+            bit = 1 << shift
+            while bit & values:
+                if bit != excluded:
+                    list_of_specializations.append(rest | bit)
+                bit <<= 1
+    return list_of_specializations
+
+
+def empty_fields(h, layout):
+    """
+    Selects the fields of a packed hypothesis that are None.
+
+    Args:
+        h (int): The hypothesis.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        int: The masks of the None fields of h, combined.
+    """
+    bits = 0
+    for shift, mask in layout:
+        if not h & mask:
+            bits |= mask
+    return bits
+
+
+def _dominated(G):
+    """
+    Finds the members of a general boundary that are less general than another.
+
+    Without None fields, the set bits outside the '?' fields hold one value
+    per constrained attribute, and g1 is more general than g exactly when
+    the values of g1 are a strict subset of those of g. Each value set is
+    bucketed under its lowest bit, so g is only compared with the members
+    whose lowest value is one of its own.
+
+    Args:
+        G (dict): Packed hypotheses without None fields, mapped to their wildcards.
+
+    Returns:
+        set: The dominated hypotheses.
+    """
+    constrained = {g: g & ~w for g, w in G.items()}
+    by_lowest = defaultdict(list)
+    for c in constrained.values():
+        if c:
+            by_lowest[c & -c].append(c)
+    # A member with no value is all '?' and more general than every other.
+    top = 0 in constrained.values()
+    dominated = set()
+    for g, c in constrained.items():
+        rest = c
+        while rest:
+            bit = rest & -rest
+            if top or any(c1 != c and c1 & ~c == 0 for c1 in by_lowest.get(bit, ())):
+                dominated.add(g)
+                break
+            rest ^= bit
+    return dominated
+
+
+def remove_less_general(G, layout):
+    """
+    Removes hypotheses from G that are less general than another hypothesis in G.
+
+    Args:
+        G (list): The list of packed general hypotheses.
+        layout (list): Bit fields from build_layout.
+
+    Returns:
+        list: A list of hypotheses from G with less general hypotheses removed.
+    """
+    if any(empty_fields(g, layout) for g in G):
+        return [g for g in G if not any(g1 != g and g & ~g1 == 0 for g1 in G)]
+    dominated = _dominated({g: wildcards(g, layout) for g in G})
+    return [g for g in G if g not in dominated]
+
+
+def remove_more_general(S):
+    """
+    Removes hypotheses from S that are more general than another hypothesis in S.
+
+    Args:
+        S (list): The list of packed specific hypotheses.
+
+    Returns:
+        list: A list of hypotheses from S with more general hypotheses removed.
+    """
+    return [s for s in S if not any(s1 != s and s1 & ~s == 0 for s1 in S)]
+
+
+def trait_positive_hypothesis(x, S, G, layout):
+    """
+    Updates the packed boundaries based on a positive training example.
+
+    Args:
+        x (int): A packed positive training example.
+        S (list): The current specific hypotheses.
+        G (dict): The current general hypotheses, mapped to their wildcards.
+        layout (list): Bit fields from build_layout.
+    """
+    for g in [g for g in G if x & ~g]:
+        del G[g]
+    kept = [s for s in S if x & ~s == 0]
+    generalized = [get_minimal_generalizations(s, x, layout)[0] for s in S if x & ~s]
+    S[:] = remove_more_general(list(dict.fromkeys(kept + generalized)))
+
+
+def trait_negative_hypothesis(x, S, G, layout):
+    """
+    Updates the packed boundaries based on a negative training example.
+
+    Specializing a '?' field of g to the value v keeps the other fields of
+    g, so the test against a member s of S splits into a part that does not
+    depend on the field and the value of s at the field: if g is consistent
+    with s, v may be the value of s there (any value if it is '?'), and if g
+    covers s, v may be the value of s there (any value if it is None).
+
+    Args:
+        x (int): A packed negative training example.
+        S (list): The current specific hypotheses.
+        G (dict): The current general hypotheses, mapped to their wildcards.
+        layout (list): Bit fields from build_layout.
+    """
+    S[:] = [s for s in S if x & ~s]
+    consistent = [(g, w) for g, w in G.items() if not x & ~g]
+    if not consistent:
+        return
+    for g, w in consistent:
+        del G[g]
+    values = 0
+    for shift, mask in layout:
+        values |= mask & (mask >> 1)
+    shifts = [shift for shift, mask in layout]
+    S_fields = []
+    for s in S:
+        s_wildcards = wildcards(s, layout)
+        S_fields.append((s, s_wildcards, (s & ~s_wildcards) | empty_fields(s, layout)))
+    for g, w in consistent:
+        allowed = 0
+        for s, s_wildcards, covered in S_fields:
+            if not (g ^ s) & ~(w | s_wildcards):
+                allowed |= s
+            if not s & ~g:
+                allowed |= covered
+        candidates = allowed & w & values & ~x
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            mask = layout[bisect_right(shifts, bit.bit_length() - 1) - 1][1]
+            specialization = (g & ~mask) | bit
+            if specialization not in G:
+                G[specialization] = w & ~mask
+    for g in _dominated(G):
+        del G[g]
+
+
+def learn(examples, S, G, layout):
+    """
+    Runs the Candidate Elimination updates over a sequence of packed examples.
+
+    Args:
+        examples (iterable): (int, is_positive) pairs.
+        S (list): The current specific hypotheses, updated in place.
+        G (list): The current general hypotheses without None fields,
+            updated in place.
+        layout (list): Bit fields from build_layout.
+    """
+    boundary = {g: wildcards(g, layout) for g in G}
+    for x, positive in examples:
+        if positive:
+            trait_positive_hypothesis(x, S, boundary, layout)
+        else:
+            trait_negative_hypothesis(x, S, boundary, layout)
+    G[:] = boundary
+
+
+def run(data_path):
+    """
+    Learns the version space of a CSV file with the bitset engine.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        tuple: The final S and G boundaries, decoded into list-based hypotheses.
+    """
+    examples, unique_values, layout, S, G = load_data(data_path)
+    learn(examples, S, G, layout)
+    return ([decode_hypothesis(s, unique_values, layout) for s in S],
+            [decode_hypothesis(g, unique_values, layout) for g in G])
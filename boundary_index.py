@@ -0,0 +1,118 @@
+"""
+Generality index over a boundary set.
+
+Hypotheses are bucketed by level (the number of attributes that are not '?')
+and posted under each (attribute, value) pair they constrain. A hypothesis can
+only be strictly more general than h if every attribute it constrains agrees
+with h, so dominance queries count posting hits for h's own values instead of
+comparing h with every member of the boundary.
+"""
+from collections import Counter, defaultdict
+
+
+class GeneralityIndex:
+    """Boundary hypotheses indexed by level and per-attribute value postings"""
+
+    def __init__(self, hypotheses=(), any_value='?', empty=None):
+        """
+        Args:
+            hypotheses (iterable): Initial hypotheses, in the list form used by main.py.
+            any_value: The value standing for '?', such as encoded.ANY.
+            empty: The value standing for None, such as encoded.EMPTY.
+        """
+        self._any = any_value
+        self._empty = empty
+        self._hypotheses = {}
+        self._level = {}
+        self._levels = defaultdict(set)
+        self._postings = defaultdict(set)
+        self._constrained = defaultdict(set)
+        self._next_key = 0
+        for h in hypotheses:
+            self.add(h)
+
+    def __len__(self):
+        return len(self._hypotheses)
+
+    def add(self, h):
+        """
+        Indexes a hypothesis.
+
+        Args:
+            h (list): The hypothesis.
+
+        Returns:
+            int: A key that can be passed to remove.
+        """
+        key = self._next_key
+        self._next_key += 1
+        level = 0
+        for i, v in enumerate(h):
+            if v != self._any:
+                level += 1
+                self._postings[(i, v)].add(key)
+                self._constrained[i].add(key)
+        self._hypotheses[key] = h
+        self._level[key] = level
+        self._levels[level].add(key)
+        return key
+
+    def remove(self, key):
+        """
+        Removes a hypothesis from the index.
+
+        Args:
+            key (int): The key returned by add.
+        """
+        h = self._hypotheses.pop(key)
+        self._levels[self._level.pop(key)].discard(key)
+        for i, v in enumerate(h):
+            if v != self._any:
+                self._postings[(i, v)].discard(key)
+                self._constrained[i].discard(key)
+
+    def has_more_general(self, h):
+        """
+        Checks if some indexed hypothesis is strictly more general than h.
+
+        Args:
+            h (list): The hypothesis.
+
+        Returns:
+            bool: True if h is dominated by a member of the index.
+        """
+        if any(self._hypotheses[key] != h for key in self._levels[0]):
+            return True
+        hits = Counter()
+        for i, v in enumerate(h):
+            if v == self._empty:
+                # Any value is at least as general as None.
+                hits.update(self._constrained[i])
+            elif v != self._any:
+                hits.update(self._postings[(i, v)])
+        return any(count == self._level[key] and self._hypotheses[key] != h
+                   for key, count in hits.items())
+
+    def has_less_general(self, h):
+        """
+        Checks if some indexed hypothesis is strictly less general than h.
+
+        Args:
+            h (list): The hypothesis.
+
+        Returns:
+            bool: True if h dominates a member of the index.
+        """
+        required = 0
+        hits = Counter()
+        for i, v in enumerate(h):
+            if v == self._any:
+                continue
+            required += 1
+            hits.update(self._postings[(i, self._empty)])
+            if v != self._empty:
+                hits.update(self._postings[(i, v)])
+        if required == 0:
+            return any(other != h for other in self._hypotheses.values())
+        return any(count == required and self._hypotheses[key] != h
+                   for key, count in hits.items())
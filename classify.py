@@ -0,0 +1,115 @@
+"""
+Batched classification of unlabeled instances with a learned version space.
+
+An instance is positive when every member of S covers it (so every
+hypothesis of the version space does), negative when no member of G covers
+it, and unknown otherwise. The vote is the fraction of S and G members that
+cover the instance.
+
+Instances are encoded column by column into the integer codes of
+``encoded.py`` and each boundary hypothesis is tested against the whole batch
+at once with numpy comparisons, instead of calling is_consistent per row per
+hypothesis.
+"""
+import numpy as np
+import pandas as pd
+
+import encoded
+
+POSITIVE = 'positive'
+NEGATIVE = 'negative'
+UNKNOWN = 'unknown'
+
+
+def encode_instances(df, unique_values):
+    """
+    Encodes the feature columns of a batch into a matrix of value codes.
+
+    Args:
+        df (pandas.DataFrame): The instances; the first len(unique_values)
+            columns are the features, in order, and any further column
+            (such as a target) is ignored.
+        unique_values (list): List of unique values for each feature.
+
+    Returns:
+        numpy.ndarray: An (instances, features) array of codes; values not
+                       in a feature's domain get the code -1, which no
+                       specific hypothesis value matches.
+    """
+    n_features = len(unique_values)
+    if df.shape[1] < n_features:
+        raise ValueError(f"Expected {n_features} feature columns, got {df.shape[1]}")
+    codes = np.empty((len(df), n_features), dtype=np.int32)
+    for i, values in enumerate(unique_values):
+        codes[:, i] = pd.Index(values).get_indexer(df.iloc[:, i])
+    return codes
+
+
+def coverage(codes, hypotheses):
+    """
+    Counts, for every instance, the hypotheses that cover it.
+
+    Args:
+        codes (numpy.ndarray): Instance codes from encode_instances.
+        hypotheses (list): Encoded hypotheses, as from encoded.encode_hypothesis.
+
+    Returns:
+        numpy.ndarray: The number of covering hypotheses per instance.
+    """
+    counts = np.zeros(len(codes), dtype=np.int64)
+    for h in hypotheses:
+        covered = np.ones(len(codes), dtype=bool)
+        for i, value in enumerate(h):
+            if value != encoded.ANY:
+                # EMPTY (None) equals no instance code, so it covers nothing.
+                covered &= codes[:, i] == value
+        counts += covered
+    return counts
+
+
+def classify(instances, S, G, unique_values):
+    """
+    Labels a batch of instances with the version space bounded by S and G.
+
+    A collapsed version space (S or G empty) labels every instance unknown.
+
+    Args:
+        instances (pandas.DataFrame): The instances; see encode_instances.
+        S (list): The specific hypotheses.
+        G (list): The general hypotheses.
+        unique_values (list): List of unique values for each feature.
+
+    Returns:
+        pandas.DataFrame: A 'label' column ('positive', 'negative' or
+                          'unknown') and a 'vote' column, with the index of
+                          instances.
+    """
+    codes = encode_instances(instances, unique_values)
+    labels = np.full(len(codes), UNKNOWN, dtype=object)
+    if not S or not G:
+        return pd.DataFrame({'label': labels, 'vote': np.nan}, index=instances.index)
+    codebooks = encoded.build_codebooks(unique_values)
+    s_covering = coverage(codes, [encoded.encode_hypothesis(s, codebooks) for s in S])
+    g_covering = coverage(codes, [encoded.encode_hypothesis(g, codebooks) for g in G])
+    labels[s_covering == len(S)] = POSITIVE
+    labels[g_covering == 0] = NEGATIVE
+    vote = (s_covering + g_covering) / (len(S) + len(G))
+    return pd.DataFrame({'label': labels, 'vote': vote}, index=instances.index)
+
+
+def classify_csv(data_path, S, G, unique_values, chunksize=100_000):
+    """
+    Labels the rows of a CSV file chunk by chunk.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        S (list): The specific hypotheses.
+        G (list): The general hypotheses.
+        unique_values (list): List of unique values for each feature.
+        chunksize (int): Number of rows read per chunk.
+
+    Yields:
+        pandas.DataFrame: The classify result of each chunk.
+    """
+    for chunk in pd.read_csv(data_path, chunksize=chunksize):
+        yield classify(chunk, S, G, unique_values)
@@ -0,0 +1,215 @@
+"""
+Headless command-line entry point for the Candidate Elimination algorithm.
+
+Usage:
+
+    python cli.py data.csv --format json
+    python cli.py data.csv --label-column Play --positive Y --negative N --format jsonl
+    python cli.py data.csv --features Outlook,Wind --label-column Play
+    python cli.py data.csv --format binary --output version_space.bin
+    python cli.py data.csv --trace trace.csv
+    python cli.py data.csv --one-vs-rest --format jsonl
+
+JSON output is a single object with the feature names and the S and G
+boundaries; JSON lines output has one object per hypothesis; binary output is
+a VersionSpace checkpoint that can be reloaded and trained further. --trace
+writes a per-example instrumentation trace (JSON, or CSV by extension).
+--one-vs-rest learns one version space per target value in a single pass;
+its JSON output lists the S and G of every class, and each JSON line then
+carries the class of its hypothesis.
+"""
+import argparse
+import json
+import sys
+
+from instrumentation import Instrumentation
+from main import (
+    check_indicators, extract_examples, extract_labelled, learn, learn_one_vs_rest, load_data,
+    select_classes
+)
+from version_space import VersionSpace
+
+
+def learn_file(data_path, label_column=None, positive='Yes', negative='No', feature_columns=None):
+    """
+    Learns the version space of a CSV file.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column.
+        positive: The target value marking a positive example.
+        negative: The target value marking a negative example.
+        feature_columns (list, optional): Names of the feature columns;
+            defaults to every column but the label.
+
+    Returns:
+        tuple: The feature names and the trained VersionSpace.
+
+    Raises:
+        ValueError: If a selected column or either indicator is missing.
+    """
+    df, unique_values, S, G = load_data(data_path, feature_columns, label_column)
+    check_indicators(unique_values[-1] if unique_values else [], positive, negative)
+    learn(extract_examples(df, positive), S, G, unique_values)
+    features = list(df.columns[:-1])
+    return features, VersionSpace(unique_values[:-1], S, G, positive, n_examples=len(df))
+
+
+def learn_classes_file(data_path, label_column=None, feature_columns=None, classes=None):
+    """
+    Learns one version space per class of a CSV file's target column.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column.
+        feature_columns (list, optional): Names of the feature columns;
+            defaults to every column but the label.
+        classes (list, optional): The classes to learn; defaults to every
+            target value.
+
+    Returns:
+        tuple: The feature names, and a dict mapping each class to its
+               trained VersionSpace.
+
+    Raises:
+        ValueError: If a selected column or class is missing.
+    """
+    df, unique_values, S, G = load_data(data_path, feature_columns, label_column)
+    classes = select_classes(unique_values[-1] if unique_values else [], classes)
+    boundaries = learn_one_vs_rest(extract_labelled(df), unique_values[:-1], classes)
+    features = list(df.columns[:-1])
+    return features, {c: VersionSpace(unique_values[:-1], S_c, G_c, c, n_examples=len(df))
+                      for c, (S_c, G_c) in boundaries.items()}
+
+
+def to_json(features, version_space):
+    """
+    Builds the JSON document for a learned version space.
+
+    Args:
+        features (list): The feature names.
+        version_space (VersionSpace): The learned version space.
+
+    Returns:
+        dict: The features, the positive indicator, the example count, and S and G.
+    """
+    return {
+        'features': features,
+        'positive': version_space.positive,
+        'examples': version_space.n_examples,
+        'S': version_space.S,
+        'G': version_space.G,
+    }
+
+
+def iter_json_lines(features, version_space, target_class=None):
+    """
+    Yields one JSON line per hypothesis of S and G.
+
+    Args:
+        features (list): The feature names.
+        version_space (VersionSpace): The learned version space.
+        target_class (optional): When given, added to every line under
+            'class', for one-vs-rest output.
+
+    Yields:
+        str: A JSON object with the boundary name and the hypothesis keyed by feature.
+    """
+    for boundary, hypotheses in (('S', version_space.S), ('G', version_space.G)):
+        for h in hypotheses:
+            line = {'boundary': boundary, 'hypothesis': dict(zip(features, h))}
+            if target_class is not None:
+                line = {'class': target_class, **line}
+            yield json.dumps(line, ensure_ascii=False, default=str)
+
+
+def classes_to_json(features, version_spaces):
+    """
+    Builds the JSON document for one-vs-rest version spaces.
+
+    Args:
+        features (list): The feature names.
+        version_spaces (dict): Maps each class to its learned VersionSpace.
+
+    Returns:
+        dict: The features, the example count, and the S and G of every class.
+    """
+    return {
+        'features': features,
+        'examples': next(iter(version_spaces.values())).n_examples if version_spaces else 0,
+        'classes': [{'class': c, 'S': vs.S, 'G': vs.G} for c, vs in version_spaces.items()],
+    }
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('data_path', help="CSV file to learn from")
+    parser.add_argument('--label-column', default=None,
+                        help="Name of the target column (default: last column)")
+    parser.add_argument('--features', default=None,
+                        help="Comma-separated feature columns (default: every column but the label)")
+    parser.add_argument('--positive', default='Yes', help="Positive class indicator")
+    parser.add_argument('--negative', default='No', help="Negative class indicator")
+    parser.add_argument('--format', choices=['json', 'jsonl', 'binary'], default='json',
+                        help="Output format (default: json)")
+    parser.add_argument('--output', default=None,
+                        help="Output file (default: stdout; required for binary)")
+    parser.add_argument('--trace', default=None,
+                        help="Write an instrumentation trace of the run to this .json or .csv file")
+    parser.add_argument('--one-vs-rest', action='store_true',
+                        help="Learn one version space per target value instead of --positive/--negative")
+    args = parser.parse_args(argv)
+    if args.format == 'binary' and args.output is None:
+        parser.error("--format binary requires --output")
+    if args.format == 'binary' and args.one_vs_rest:
+        parser.error("--one-vs-rest supports json and jsonl output only")
+
+    trace = Instrumentation() if args.trace else None
+    try:
+        if trace is not None:
+            trace.enable()
+        feature_columns = args.features.split(',') if args.features else None
+        if args.one_vs_rest:
+            features, version_spaces = learn_classes_file(args.data_path, args.label_column,
+                                                          feature_columns)
+        else:
+            features, version_space = learn_file(args.data_path, args.label_column,
+                                                 args.positive, args.negative, feature_columns)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if trace is not None:
+            trace.disable()
+    if trace is not None:
+        trace.export(args.trace)
+
+    if args.format == 'binary':
+        version_space.save(args.output)
+        return 0
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.one_vs_rest and args.format == 'json':
+            json.dump(classes_to_json(features, version_spaces), out, ensure_ascii=False, default=str)
+            out.write('\n')
+        elif args.one_vs_rest:
+            for c, version_space in version_spaces.items():
+                for line in iter_json_lines(features, version_space, c):
+                    out.write(line + '\n')
+        elif args.format == 'json':
+            json.dump(to_json(features, version_space), out, ensure_ascii=False, default=str)
+            out.write('\n')
+        else:
+            for line in iter_json_lines(features, version_space):
+                out.write(line + '\n')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+"""
+Convert-once columnar dataset format for repeated training runs.
+
+A CSV file is converted a single time into a directory holding one ``.npy``
+file of integer value codes per column and ``meta.json`` with the column
+names, row count and value dictionary (the unique values of each column, in
+order of first appearance as in ``main.load_data``). Loading memory-maps the
+columns, so startup does not depend on the size of the dataset; examples are
+decoded from the mapped codes block by block while learning. ``run`` trains
+with main.learn on the decoded value rows; ``load_data`` instead hands code
+tuples to callers of ``encoded.py``.
+
+Usage:
+
+    python columnar.py data.csv data.cecols
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import encoded
+from main import learn, parse_cells
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+BLOCK_ROWS = 100_000
+
+
+def _column_file(directory, index):
+    return Path(directory) / f"{index}.npy"
+
+
+def _code_dtype(cardinality):
+    """Returns the smallest integer dtype holding codes 0 .. cardinality - 1."""
+    for dtype in (np.uint8, np.uint16, np.int32):
+        if cardinality <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def convert(data_path, output_dir, chunksize=1_000_000):
+    """
+    Converts a CSV file into the columnar format.
+
+    The file is read once in chunks of strings, and codes of the distinct
+    cells are appended to a raw file per column. At the end every column's
+    cells are typed once, as main.load_data types them, so a column does not
+    change type from chunk to chunk; cells sharing a value (e.g. '1' and
+    '01', or two spellings of a missing value) share its code in the
+    ``.npy`` files of the smallest fitting integer type.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        output_dir (str): Directory receiving the dataset; created if needed.
+        chunksize (int): Number of rows read per chunk.
+
+    Returns:
+        dict: The metadata written to meta.json.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    columns = None
+    codebooks = []
+    raw_files = []
+    n_rows = 0
+    try:
+        for chunk in pd.read_csv(data_path, chunksize=chunksize, dtype=str, na_filter=False):
+            if columns is None:
+                columns = chunk.columns.tolist()
+                codebooks = [{} for _ in columns]
+                raw_files = [open(output_dir / f"{i}.raw", 'wb') for i in range(len(columns))]
+            for i, column in enumerate(columns):
+                local_codes, uniques = pd.factorize(chunk[column])
+                book = codebooks[i]
+                mapping = np.array([book.setdefault(cell, len(book)) for cell in uniques.tolist()],
+                                   dtype=np.int32)
+                mapping[local_codes].tofile(raw_files[i])
+            n_rows += len(chunk)
+    finally:
+        for f in raw_files:
+            f.close()
+
+    columns = columns or []
+    unique_values = []
+    for i, book in enumerate(codebooks):
+        parsed = parse_cells(list(book))
+        typed = [parsed[cell] for cell in book]
+        values = list(dict.fromkeys(typed))
+        codes = {value: code for code, value in enumerate(values)}
+        remap = np.array([codes[value] for value in typed], dtype=np.int32)
+        unique_values.append(values)
+        raw_path = output_dir / f"{i}.raw"
+        packed = np.lib.format.open_memmap(_column_file(output_dir, i), mode='w+',
+                                           dtype=_code_dtype(len(values)), shape=(n_rows,))
+        raw = np.memmap(raw_path, dtype=np.int32, mode='r', shape=(n_rows,)) if n_rows else None
+        for start in range(0, n_rows, BLOCK_ROWS):
+            packed[start:start + BLOCK_ROWS] = remap[raw[start:start + BLOCK_ROWS]]
+        del raw
+        packed.flush()
+        del packed
+        os.remove(raw_path)
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'columns': columns,
+        'rows': n_rows,
+        'unique_values': unique_values,
+    }
+    with open(output_dir / META_FILE, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+
+def load(path):
+    """
+    Maps a converted dataset into memory without reading its codes.
+
+    Args:
+        path (str): The dataset directory written by convert.
+
+    Returns:
+        tuple: The column names, the unique values per column, and one
+               read-only memory-mapped array of codes per column.
+
+    Raises:
+        ValueError: If the directory is not a converted dataset.
+    """
+    try:
+        with open(Path(path) / META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        raise ValueError(f"{path} is not a columnar dataset")
+    if meta.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a columnar dataset")
+    codes = [np.load(_column_file(path, i), mmap_mode='r') for i in range(len(meta['columns']))]
+    return meta['columns'], meta['unique_values'], codes
+
+
+def iter_examples(codes, positive_code, order=None, block_rows=BLOCK_ROWS):
+    """
+    Yields encoded examples from mapped columns, one block of rows at a time.
+
+    Args:
+        codes (list): The mapped code arrays, the target last.
+        positive_code (int): Code of the positive target value, or -1 if
+            the target column never takes it.
+        order (array-like, optional): Row indices giving the order in which
+            examples are learned; defaults to file order.
+        block_rows (int): Number of rows decoded at once.
+
+    Yields:
+        tuple: An (example, is_positive) pair, the example a tuple of codes.
+    """
+    n_rows = len(codes[-1]) if codes else 0
+    for start in range(0, n_rows if order is None else len(order), block_rows):
+        rows = slice(start, start + block_rows) if order is None else np.asarray(order[start:start + block_rows])
+        features = np.stack([column[rows] for column in codes[:-1]], axis=1)
+        labels = codes[-1][rows] == positive_code
+        yield from zip(map(tuple, features.tolist()), labels.tolist())
+
+
+def iter_rows(codes, unique_values, positive_code, order=None, block_rows=BLOCK_ROWS):
+    """
+    Yields examples from mapped columns as value rows, one block of rows at a time.
+
+    Args:
+        codes (list): The mapped code arrays, the target last.
+        unique_values (list): The unique values per column, the target last.
+        positive_code (int): Code of the positive target value, or -1 if
+            the target column never takes it.
+        order (array-like, optional): Row indices giving the order in which
+            examples are learned; defaults to file order.
+        block_rows (int): Number of rows decoded at once.
+
+    Yields:
+        tuple: A (row, is_positive) pair, the row a list of feature values,
+               as from main.extract_examples.
+    """
+    lookups = [np.array(values, dtype=object) for values in unique_values[:-1]]
+    n_rows = len(codes[-1]) if codes else 0
+    for start in range(0, n_rows if order is None else len(order), block_rows):
+        rows = slice(start, start + block_rows) if order is None else np.asarray(order[start:start + block_rows])
+        features = np.stack([lookup[column[rows]] for lookup, column in zip(lookups, codes[:-1])], axis=1)
+        labels = codes[-1][rows] == positive_code
+        yield from zip(features.tolist(), labels.tolist())
+
+
+def load_data(path, positive='Yes', order=None):
+    """
+    Loads a converted dataset for the integer-encoded engine, like encoded.load_data.
+
+    Args:
+        path (str): The dataset directory written by convert.
+        positive: The target value marking a positive example.
+        order (array-like, optional): Row indices giving the learning order.
+
+    Returns:
+        tuple: The encoded examples (a lazy iterator), unique values per
+               column, the codebooks, and the encoded S0 and G0.
+    """
+    columns, unique_values, codes = load(path)
+    codebooks = encoded.build_codebooks(unique_values)
+    positive_code = codebooks[-1].get(positive, -1) if codebooks else -1
+    examples = iter_examples(codes, positive_code, order)
+    n = len(columns) - 1
+    return examples, unique_values, codebooks, [(encoded.EMPTY,) * n], [(encoded.ANY,) * n]
+
+
+def run(path, positive='Yes', order=None):
+    """
+    Learns the version space of a converted dataset with main.learn.
+
+    Args:
+        path (str): The dataset directory written by convert.
+        positive: The target value marking a positive example.
+        order (array-like, optional): Row indices giving the learning order.
+
+    Returns:
+        tuple: The final S and G boundaries, decoded into list-based hypotheses.
+    """
+    columns, unique_values, codes = load(path)
+    positive_code = encoded.build_codebooks(unique_values[-1:])[0].get(positive, -1) if codes else -1
+    n = len(columns) - 1
+    S, G = [[None] * n], [['?'] * n]
+    learn(iter_rows(codes, unique_values, positive_code, order), S, G, unique_values[:-1])
+    return S, G
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('data_path', help="CSV file to convert")
+    parser.add_argument('output_dir', help="Directory receiving the columnar dataset")
+    parser.add_argument('--chunksize', type=int, default=1_000_000,
+                        help="Rows read per chunk (default: 1000000)")
+    args = parser.parse_args(argv)
+    meta = convert(args.data_path, args.output_dir, args.chunksize)
+    print(f"Converted {meta['rows']} rows, {len(meta['columns'])} columns to {args.output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,345 @@
+"""
+Integer-encoded Candidate Elimination engine.
+
+Every attribute value is replaced by its index in the attribute's domain (as
+computed by ``main.load_data``) and hypotheses are tuples of small integers.
+Every function here mirrors its counterpart in ``main.py``, including the
+S-guided specialization and the indexed pruning of large boundaries, and the
+tests check that both give the same boundaries.
+
+This is a port of the algorithm to integer codes, not a faster engine: since
+main.py keeps its boundaries as tuples and prunes them with the same index,
+learning with it takes about as long as with main.learn (within about 10%
+on the benchmark datasets). Use main.learn unless integer codes are what the
+caller already has, e.g. from ``columnar.load_data``.
+"""
+import main
+from boundary_index import GeneralityIndex
+
+# Reserved codes; real values are encoded as 0 .. len(domain) - 1.
+ANY = -1    # '?'
+EMPTY = -2  # None
+
+
+def build_codebooks(unique_values):
+    """
+    Builds a value-to-code mapping for each attribute.
+
+    Args:
+        unique_values (list): List of unique values for each attribute.
+
+    Returns:
+        list: One dict per attribute mapping a value to its integer code.
+    """
+    return [{value: code for code, value in enumerate(values)} for values in unique_values]
+
+
+def encode_hypothesis(h, codebooks):
+    """
+    Encodes a list-based hypothesis into a tuple of integer codes.
+
+    Args:
+        h (list): The hypothesis, using '?' and None as in main.py.
+        codebooks (list): Value-to-code mappings from build_codebooks.
+
+    Returns:
+        tuple: The encoded hypothesis.
+    """
+    return tuple(ANY if v == '?' else EMPTY if v is None else codebooks[i][v]
+                 for i, v in enumerate(h))
+
+
+def decode_hypothesis(h, unique_values):
+    """
+    Decodes a tuple of integer codes back into a list-based hypothesis.
+
+    Args:
+        h (tuple): The encoded hypothesis.
+        unique_values (list): List of unique values for each attribute.
+
+    Returns:
+        list: The hypothesis, using '?' and None as in main.py.
+    """
+    return ['?' if c == ANY else None if c == EMPTY else unique_values[i][c]
+            for i, c in enumerate(h)]
+
+
+def encode_examples(df, codebooks, positive='Yes'):
+    """
+    Encodes every row of a Table or DataFrame into an (example, is_positive) pair.
+
+    Args:
+        df (main.Table or pandas.DataFrame): The data, with the target as the last column.
+        codebooks (list): Value-to-code mappings from build_codebooks.
+        positive: The target value marking a positive example.
+
+    Returns:
+        list: A list of (tuple of codes, bool) pairs.
+    """
+    feature_books = codebooks[:-1]
+    return [(tuple(book[v] for book, v in zip(feature_books, row)), label)
+            for row, label in main.extract_examples(df, positive)]
+
+
+def load_data(data_path):
+    """
+    Loads a CSV file like main.load_data and encodes it for this engine.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        tuple: The encoded examples, unique values per column, the codebooks,
+               and the encoded initial hypotheses S0 and G0.
+    """
+    df, unique_values, S, G = main.load_data(data_path)
+    codebooks = build_codebooks(unique_values)
+    examples = encode_examples(df, codebooks)
+    return examples, unique_values, codebooks, [(EMPTY,) * len(S[0])], [(ANY,) * len(G[0])]
+
+
+def is_consistent(h, x):
+    """
+    Checks if an encoded hypothesis is consistent with an encoded example.
+
+    Args:
+        h (tuple): The hypothesis.
+        x (tuple): The example.
+
+    Returns:
+        bool: True if the hypothesis is consistent with the example, False otherwise.
+    """
+    if len(h) != len(x):
+        return False
+    for a, b in zip(h, x):
+        if a != b and a != ANY and b != ANY:
+            return False
+    return True
+
+
+def is_more_general(h1, h2):
+    """
+    Checks if encoded hypothesis h1 is strictly more general than h2.
+
+    Args:
+        h1 (tuple): The first hypothesis.
+        h2 (tuple): The second hypothesis.
+
+    Returns:
+        bool: True if h1 is more general than h2, False otherwise.
+    """
+    if len(h1) != len(h2):
+        return False
+    more_general = False
+    for a, b in zip(h1, h2):
+        if a == b:
+            continue
+        if a == ANY or b == EMPTY:
+            more_general = True
+        else:
+            return False
+    return more_general
+
+
+def get_minimal_generalizations(h, x):
+    """
+    Computes the minimal generalization of an encoded hypothesis given an example.
+
+    Args:
+        h (tuple): The hypothesis.
+        x (tuple): The example.
+
+    Returns:
+        list: A list containing the minimal generalization of h with respect to x.
+    """
+    if len(h) != len(x):
+        return []
+    if all(a == EMPTY for a in h):
+        return [tuple(x)]
+    return [tuple(a if a == ANY or a == b else b if a == EMPTY else ANY
+                  for a, b in zip(h, x))]
+
+
+def get_minimal_specializations(h, x, unique_values):
+    """
+    Computes the minimal specializations of an encoded hypothesis given an example.
+
+    Args:
+        h (tuple): The hypothesis.
+        x (tuple): The example.
+        unique_values (list): List of unique values for each attribute.
+
+    Returns:
+        list: A list of minimal specializations of h with respect to x.
+    """
+    if len(h) != len(x):
+        return []
+    list_of_specializations = []
+    for i, a in enumerate(h):
+        if a == ANY:
+            head, tail = h[:i], h[i + 1:]
+            for code in range(len(unique_values[i])):
+                if code != x[i]:
+                    list_of_specializations.append(head + (code,) + tail)
+    return list_of_specializations
+
+
+def iter_minimal_specializations(h, x, unique_values, S):
+    """
+    Yields the minimal specializations of h that exclude x and cover some member of S.
+
+    Mirrors main.iter_minimal_specializations: the values allowed at each
+    attribute are worked out from S up front, so candidates that would fail
+    the test in trait_negative_hypothesis are never built.
+
+    Args:
+        h (tuple): An encoded hypothesis consistent with x.
+        x (tuple): The encoded negative example.
+        unique_values (list): List of unique values for each attribute.
+        S (list): The current encoded specific hypotheses.
+
+    Yields:
+        tuple: A minimal specialization of h.
+    """
+    n = len(h)
+    if len(x) != n:
+        return
+    open_positions = [i for i in range(n) if h[i] == ANY and x[i] != ANY]
+    if not open_positions:
+        return
+    any_value = dict.fromkeys(open_positions, False)
+    allowed = {i: set() for i in open_positions}
+    for s in S:
+        if len(s) != n:
+            continue
+        consistent = is_consistent(h, s)
+        general = True
+        strict = 0
+        for a, b in zip(h, s):
+            if a == ANY:
+                strict += b != ANY
+            elif a != b:
+                if b != EMPTY:
+                    general = False
+                    break
+                strict += 1
+        if not (consistent or general):
+            continue
+        for i in open_positions:
+            value = s[i]
+            if value == ANY:
+                any_value[i] = any_value[i] or consistent
+            elif value == EMPTY:
+                any_value[i] = any_value[i] or general
+            elif consistent or (general and strict > 1):
+                allowed[i].add(value)
+    for i in open_positions:
+        if not (any_value[i] or allowed[i]):
+            continue
+        head, tail = h[:i], h[i + 1:]
+        for code in range(len(unique_values[i])):
+            if code != x[i] and (any_value[i] or code in allowed[i]):
+                yield head + (code,) + tail
+
+
+def remove_less_general(G):
+    """
+    Removes hypotheses from G that are less general than another hypothesis in G.
+
+    Args:
+        G (list): The list of encoded general hypotheses.
+
+    Returns:
+        list: A list of hypotheses from G with less general hypotheses removed.
+    """
+    if len(G) < main.INDEX_MIN_SIZE:
+        return [g for g in G if not any(is_more_general(g1, g) for g1 in G)]
+    index = GeneralityIndex(G, ANY, EMPTY)
+    return [g for g in G if not index.has_more_general(g)]
+
+
+def remove_more_general(S):
+    """
+    Removes hypotheses from S that are more general than another hypothesis in S.
+
+    Args:
+        S (list): The list of encoded specific hypotheses.
+
+    Returns:
+        list: A list of hypotheses from S with more general hypotheses removed.
+    """
+    if len(S) < main.INDEX_MIN_SIZE:
+        return [s for s in S if not any(is_more_general(s, s1) for s1 in S)]
+    index = GeneralityIndex(S, ANY, EMPTY)
+    return [s for s in S if not index.has_less_general(s)]
+
+
+def trait_positive_hypothesis(x, S, G):
+    """
+    Updates the encoded boundaries based on a positive training example.
+
+    Args:
+        x (tuple): An encoded positive training example.
+        S (list): The current specific hypotheses.
+        G (list): The current general hypotheses.
+    """
+    G[:] = [g for g in G if is_consistent(g, x)]
+    kept = [s for s in S if is_consistent(s, x)]
+    generalized = [get_minimal_generalizations(s, x)[0] for s in S if not is_consistent(s, x)]
+    S[:] = remove_more_general(list(dict.fromkeys(kept + generalized)))
+
+
+def trait_negative_hypothesis(x, S, G, unique_values):
+    """
+    Updates the encoded boundaries based on a negative training example.
+
+    Args:
+        x (tuple): An encoded negative training example.
+        S (list): The current specific hypotheses.
+        G (list): The current general hypotheses.
+        unique_values (list): List of unique values for each attribute.
+    """
+    S[:] = [s for s in S if not is_consistent(s, x)]
+    new_G = {}
+    specialized = []
+    for g in G:
+        if not is_consistent(g, x):
+            new_G[g] = None
+        else:
+            specialized.append(g)
+    for g in specialized:
+        new_G.update(dict.fromkeys(iter_minimal_specializations(g, x, unique_values, S)))
+    G[:] = remove_less_general(list(new_G))
+
+
+def learn(examples, S, G, unique_values):
+    """
+    Runs the Candidate Elimination updates over a sequence of encoded examples.
+
+    Args:
+        examples (iterable): (tuple of codes, is_positive) pairs.
+        S (list): The current specific hypotheses, updated in place.
+        G (list): The current general hypotheses, updated in place.
+        unique_values (list): List of unique values for each attribute.
+    """
+    for x, positive in examples:
+        if positive:
+            trait_positive_hypothesis(x, S, G)
+        else:
+            trait_negative_hypothesis(x, S, G, unique_values)
+
+
+def run(data_path):
+    """
+    Learns the version space of a CSV file with the integer-encoded engine.
+
+    Args:
+        data_path (str): The path to the CSV file.
+
+    Returns:
+        tuple: The final S and G boundaries, decoded into list-based hypotheses.
+    """
+    examples, unique_values, codebooks, S, G = load_data(data_path)
+    learn(examples, S, G, unique_values)
+    return ([decode_hypothesis(s, unique_values) for s in S],
+            [decode_hypothesis(g, unique_values) for g in G])
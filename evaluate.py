@@ -0,0 +1,310 @@
+"""
+Cross-validation and learning curves for the learned version space.
+
+k-fold and leave-one-out evaluation train one version space per fold across
+a process pool and classify the held-out rows with classify.py: a row is
+covered when the version space labels it positive or negative rather than
+unknown. Coverage is the fraction of held-out rows covered, and accuracy the
+fraction of covered rows whose label matches the target.
+
+A learning curve evaluates each fold at increasing training-set sizes. The
+version space of a size is learned on top of the boundaries of the previous
+size, since a training set is a prefix of the next one, so every fold reads
+its training rows once whatever the number of sizes.
+
+Usage:
+
+    python evaluate.py data.csv --folds 10
+    python evaluate.py data.csv --loo --workers 8
+    python evaluate.py data.csv --curve 10,50,100,500 --output curve.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from main import check_indicators, extract_examples, learn, load_data, make_boundary, boundary_to_list
+
+# Examples and domains shared by the folds; set once per worker process.
+_shared = {}
+
+
+def make_folds(n_rows, k, seed=0, shuffle=True):
+    """
+    Splits row indices into k disjoint test folds.
+
+    Args:
+        n_rows (int): Number of rows.
+        k (int): Number of folds; n_rows gives leave-one-out.
+        seed (int): Random seed of the shuffle.
+        shuffle (bool): Assign rows to folds at random instead of round-robin
+            in file order.
+
+    Returns:
+        list: One sorted list of test row indices per fold.
+
+    Raises:
+        ValueError: If k is not between 2 and n_rows.
+    """
+    if not 2 <= k <= n_rows:
+        raise ValueError(f"Number of folds must be between 2 and {n_rows}, got {k}")
+    order = list(range(n_rows))
+    if shuffle:
+        random.Random(seed).shuffle(order)
+    return [sorted(order[i::k]) for i in range(k)]
+
+
+def score(labels, targets):
+    """
+    Counts the covered and correctly labelled rows of a classification.
+
+    Args:
+        labels (iterable): Labels from classify ('positive', 'negative' or 'unknown').
+        targets (iterable): Whether each row is a positive example.
+
+    Returns:
+        dict: The 'rows', 'covered' and 'correct' counts.
+    """
+    counts = {'rows': 0, 'covered': 0, 'correct': 0}
+    for label, positive in zip(labels, targets):
+        counts['rows'] += 1
+        if label != 'unknown':
+            counts['covered'] += 1
+            counts['correct'] += (label == 'positive') == positive
+    return counts
+
+
+def summarize(counts):
+    """
+    Adds coverage and accuracy to summed counts.
+
+    Args:
+        counts (list): Count dicts from score.
+
+    Returns:
+        dict: The summed counts, 'coverage' (covered / rows) and 'accuracy'
+              (correct / covered, None when no row is covered).
+    """
+    total = {key: sum(c[key] for c in counts) for key in ('rows', 'covered', 'correct')}
+    total['coverage'] = total['covered'] / total['rows'] if total['rows'] else 0.0
+    total['accuracy'] = total['correct'] / total['covered'] if total['covered'] else None
+    return total
+
+
+def _init_worker(examples, unique_values):
+    """Stores the examples and domains in a worker process."""
+    _shared['examples'] = examples
+    _shared['unique_values'] = unique_values
+
+
+def evaluate_fold(test, sizes=None):
+    """
+    Trains on every row outside a fold and scores the fold.
+
+    Reads the examples and domains set by _init_worker. Training rows are
+    learned in file order.
+
+    Args:
+        test (list): Sorted test row indices.
+        sizes (list, optional): Ascending training-set sizes to score the
+            fold at; each is learned on top of the previous one. Defaults
+            to the whole training set.
+
+    Returns:
+        list: One dict per size with its 'size' (capped at the number of
+              training rows), 'S_size', 'G_size' and the score counts.
+    """
+    from classify import classify
+    import pandas as pd
+    examples, unique_values = _shared['examples'], _shared['unique_values']
+    held_out = set(test)
+    train = [example for i, example in enumerate(examples) if i not in held_out]
+    instances = pd.DataFrame([examples[i][0] for i in test])
+    targets = [examples[i][1] for i in test]
+    n = len(unique_values)
+    S, G = make_boundary([[None] * n]), make_boundary([['?'] * n])
+    results = []
+    learned = 0
+    for size in sizes or [len(train)]:
+        size = min(size, len(train))
+        if S and G:
+            # An empty boundary stays empty, and labels every row unknown.
+            learn(train[learned:size], S, G, unique_values)
+        learned = max(learned, size)
+        labels = classify(instances, boundary_to_list(S), boundary_to_list(G), unique_values)['label']
+        results.append({'size': size, 'S_size': len(S), 'G_size': len(G), **score(labels, targets)})
+    return results
+
+
+def _evaluate_folds(examples, unique_values, folds, sizes, workers):
+    """Runs evaluate_fold over the folds in a process pool, in fold order."""
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(folds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(examples, unique_values)) as executor:
+        return list(executor.map(evaluate_fold, folds, [sizes] * len(folds), chunksize=chunksize))
+
+
+def load_examples(data_path, positive='Yes', negative='No', label_column=None):
+    """
+    Loads the examples and feature domains of a dataset.
+
+    Args:
+        data_path (str or pandas.DataFrame): The CSV file or a loaded DataFrame.
+        positive: The target value marking a positive example.
+        negative: The target value marking a negative example.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column.
+
+    Returns:
+        tuple: The (row, is_positive) examples as a list, and the unique
+               values of each feature.
+
+    Raises:
+        ValueError: If the label column or either indicator is missing.
+    """
+    df, unique_values, S, G = load_data(data_path, label_column=label_column)
+    check_indicators(unique_values[-1] if unique_values else [], positive, negative)
+    return list(extract_examples(df, positive)), unique_values[:-1]
+
+
+def cross_validate(examples, unique_values, k=10, seed=0, shuffle=True, workers=None):
+    """
+    Estimates coverage and accuracy with k-fold cross-validation.
+
+    Args:
+        examples (list): (row, is_positive) pairs, as from load_examples.
+        unique_values (list): List of unique values for each feature.
+        k (int): Number of folds; len(examples) gives leave-one-out.
+        seed (int): Random seed of the fold assignment.
+        shuffle (bool): Assign rows to folds at random; see make_folds.
+        workers (int, optional): Number of worker processes; defaults to
+            the number of CPUs.
+
+    Returns:
+        dict: The overall counts, coverage and accuracy, the number of
+              'folds', one result dict per fold under 'fold_results', and
+              the 'wall_seconds' taken.
+    """
+    start = time.perf_counter()
+    folds = make_folds(len(examples), k, seed, shuffle)
+    fold_results = [results[0] for results in _evaluate_folds(examples, unique_values, folds, None, workers)]
+    return {
+        'folds': k,
+        **summarize(fold_results),
+        'fold_results': fold_results,
+        'wall_seconds': time.perf_counter() - start,
+    }
+
+
+def leave_one_out(examples, unique_values, workers=None):
+    """
+    Estimates coverage and accuracy by holding out each row in turn.
+
+    Args:
+        examples (list): (row, is_positive) pairs, as from load_examples.
+        unique_values (list): List of unique values for each feature.
+        workers (int, optional): Number of worker processes.
+
+    Returns:
+        dict: As cross_validate, with one fold per row.
+    """
+    return cross_validate(examples, unique_values, len(examples), shuffle=False, workers=workers)
+
+
+def learning_curve(examples, unique_values, sizes, k=5, seed=0, workers=None):
+    """
+    Measures coverage and accuracy as the training set grows.
+
+    Every fold learns its training rows in a random order once, and is
+    scored each time the learned prefix reaches one of the sizes.
+
+    Args:
+        examples (list): (row, is_positive) pairs, as from load_examples.
+        unique_values (list): List of unique values for each feature.
+        sizes (list): Training-set sizes; sizes beyond the training rows of
+            a fold are capped.
+        k (int): Number of folds.
+        seed (int): Random seed of the fold assignment and learning order.
+        workers (int, optional): Number of worker processes.
+
+    Returns:
+        dict: The number of 'folds', one 'points' entry per size with its
+              mean |S| and |G| and overall counts, coverage and accuracy,
+              and the 'wall_seconds' taken.
+    """
+    start = time.perf_counter()
+    sizes = sorted(set(sizes))
+    order = list(range(len(examples)))
+    random.Random(seed).shuffle(order)
+    shuffled = [examples[i] for i in order]
+    folds = make_folds(len(shuffled), k, shuffle=False)
+    per_fold = _evaluate_folds(shuffled, unique_values, folds, sizes, workers)
+    points = []
+    for i, size in enumerate(sizes):
+        results = [fold[i] for fold in per_fold]
+        points.append({
+            'size': size,
+            'S_size': sum(r['S_size'] for r in results) / k,
+            'G_size': sum(r['G_size'] for r in results) / k,
+            **summarize(results),
+        })
+    return {'folds': k, 'points': points, 'wall_seconds': time.perf_counter() - start}
+
+
+def _parse_sizes(text):
+    """Parses a comma-separated list of positive training-set sizes."""
+    sizes = [int(size) for size in text.split(',') if size.strip()]
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("sizes must be positive integers")
+    return sizes
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('data_path', help="Input CSV file")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--folds', type=int, default=10, help="Number of folds (default: 10)")
+    mode.add_argument('--loo', action='store_true', help="Leave-one-out evaluation")
+    parser.add_argument('--curve', type=_parse_sizes, default=None,
+                        help="Comma-separated training-set sizes of a learning curve")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('--label-column', default=None,
+                        help="Name of the target column (default: last column)")
+    parser.add_argument('--positive', default='Yes', help="Positive class indicator")
+    parser.add_argument('--negative', default='No', help="Negative class indicator")
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        examples, unique_values = load_examples(args.data_path, args.positive, args.negative,
+                                                args.label_column)
+        if args.curve:
+            report = learning_curve(examples, unique_values, args.curve, args.folds, args.seed,
+                                    args.workers)
+        elif args.loo:
+            report = leave_one_out(examples, unique_values, args.workers)
+        else:
+            report = cross_validate(examples, unique_values, args.folds, args.seed,
+                                    workers=args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,113 @@
+"""
+Append-only store for the GUI's processing history.
+
+Entry metadata is kept one JSON object per line in ``history_index.jsonl``
+and each entry's full algorithm output is appended to ``history_outputs.txt``;
+the index records the byte offset and length of the output. Startup reads
+only the index, saving appends two short writes, and an output is read from
+disk only when it is displayed.
+"""
+import json
+import os
+from pathlib import Path
+
+INDEX_FILE = "history_index.jsonl"
+OUTPUTS_FILE = "history_outputs.txt"
+LEGACY_FILE = "history.json"
+
+
+class HistoryStore:
+    """Processing history with lazily loaded outputs"""
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directory holding the history files; created if needed.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / INDEX_FILE
+        self.outputs_path = self.directory / OUTPUTS_FILE
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Imports a history.json written by older versions, then renames it."""
+        legacy_path = self.directory / LEGACY_FILE
+        if not legacy_path.exists() or self.index_path.exists():
+            return
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for entry in entries:
+            self.append(entry)
+        os.replace(legacy_path, legacy_path.with_name(LEGACY_FILE + ".migrated"))
+
+    def load(self):
+        """
+        Reads the metadata of every entry, oldest first.
+
+        Returns:
+            list: Metadata dicts; outputs are not included.
+        """
+        entries = []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # A torn last line from an interrupted write.
+                        continue
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append(self, entry):
+        """
+        Appends an entry.
+
+        Args:
+            entry (dict): The entry, including its 'output' text.
+
+        Returns:
+            dict: The stored metadata, without the output.
+        """
+        meta = {key: value for key, value in entry.items() if key != 'output'}
+        output = entry.get('output', '').encode('utf-8')
+        with open(self.outputs_path, 'ab') as f:
+            meta['output_offset'] = f.tell()
+            f.write(output)
+        meta['output_length'] = len(output)
+        line = (json.dumps(meta, ensure_ascii=False) + '\n').encode('utf-8')
+        with open(self.index_path, 'ab+') as f:
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # End a torn last line so this entry starts on its own line.
+                    line = b'\n' + line
+            f.write(line)
+        return meta
+
+    def read_output(self, meta):
+        """
+        Reads the full output of an entry.
+
+        Args:
+            meta (dict): Metadata returned by load or append.
+
+        Returns:
+            str: The algorithm output.
+        """
+        with open(self.outputs_path, 'rb') as f:
+            f.seek(meta['output_offset'])
+            return f.read(meta['output_length']).decode('utf-8')
+
+    def clear(self):
+        """Deletes every entry."""
+        for path in (self.index_path, self.outputs_path):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
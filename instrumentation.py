@@ -0,0 +1,159 @@
+"""
+Opt-in instrumentation of the learning hot path.
+
+While an Instrumentation is enabled, the hot functions of main.py are
+replaced by counting and timing wrappers; disabling it puts the originals
+back, so an uninstrumented run pays nothing. Usage:
+
+    with Instrumentation() as trace:
+        run('data.csv')
+    trace.export('trace.csv')
+
+Each example learned records its wall time, |S| and |G| afterwards, the
+candidate specializations generated, the hypotheses removed by pruning, and
+the is_consistent / is_more_general calls it made. Examples learned by
+worker processes (a parallel G expansion) or through functions imported
+from main before enabling are not seen by the wrappers.
+"""
+import csv
+import json
+import time
+from pathlib import Path
+
+import main
+
+EXAMPLE_FUNCTIONS = {'trait_positive_hypothesis': True, 'trait_negative_hypothesis': False}
+SPECIALIZATION_FUNCTIONS = ('get_minimal_specializations', 'iter_minimal_specializations')
+PRUNING_FUNCTIONS = ('remove_less_general', 'remove_more_general')
+PREDICATES = ('is_consistent', 'is_more_general')
+INSTRUMENTED = ('trait_row', *EXAMPLE_FUNCTIONS, *SPECIALIZATION_FUNCTIONS, *PRUNING_FUNCTIONS, *PREDICATES)
+ROW_FIELDS = ('row', 'positive', 'seconds', 'S_size', 'G_size', 'generated', 'pruned', *PREDICATES)
+
+
+class Instrumentation:
+    """Per-example trace and call counts of the learning functions in main.py"""
+
+    def __init__(self):
+        self.calls = dict.fromkeys(INSTRUMENTED, 0)
+        self.rows = []
+        self._row = None
+        self._originals = {}
+
+    @property
+    def enabled(self):
+        """bool: Whether main's functions are currently wrapped."""
+        return bool(self._originals)
+
+    def enable(self):
+        """Replaces main's hot functions by instrumented wrappers."""
+        if self.enabled:
+            return
+        for name in INSTRUMENTED:
+            original = getattr(main, name)
+            self._originals[name] = original
+            setattr(main, name, self._wrap(name, original))
+
+    def disable(self):
+        """Restores main's original functions."""
+        for name, original in self._originals.items():
+            setattr(main, name, original)
+        self._originals = {}
+        self._row = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    def _wrap(self, name, function):
+        """Builds the wrapper recording the calls of one function."""
+        calls = self.calls
+        if name in EXAMPLE_FUNCTIONS:
+            positive = EXAMPLE_FUNCTIONS[name]
+
+            def wrapper(row, S, G, *args, **kwargs):
+                calls[name] += 1
+                record = dict.fromkeys(ROW_FIELDS, 0)
+                record.update(row=len(self.rows), positive=positive)
+                self._row = record
+                start = time.perf_counter()
+                try:
+                    return function(row, S, G, *args, **kwargs)
+                finally:
+                    record.update(seconds=time.perf_counter() - start, S_size=len(S), G_size=len(G))
+                    self._row = None
+                    self.rows.append(record)
+        elif name == 'iter_minimal_specializations':
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                for candidate in function(*args, **kwargs):
+                    if self._row is not None:
+                        self._row['generated'] += 1
+                    yield candidate
+        elif name == 'get_minimal_specializations':
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                candidates = function(*args, **kwargs)
+                if self._row is not None:
+                    self._row['generated'] += len(candidates)
+                return candidates
+        elif name in PRUNING_FUNCTIONS:
+            def wrapper(boundary):
+                calls[name] += 1
+                kept = function(boundary)
+                if self._row is not None:
+                    self._row['pruned'] += len(boundary) - len(kept)
+                return kept
+        elif name in PREDICATES:
+            def wrapper(*args):
+                calls[name] += 1
+                if self._row is not None:
+                    self._row[name] += 1
+                return function(*args)
+        else:
+            def wrapper(*args, **kwargs):
+                calls[name] += 1
+                return function(*args, **kwargs)
+        wrapper.__name__ = name
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+
+    def summary(self):
+        """
+        Aggregates the trace.
+
+        Returns:
+            dict: Examples seen, total seconds, candidates generated and
+                  pruned, the largest |S| and |G|, and the call counts.
+        """
+        return {
+            'examples': len(self.rows),
+            'seconds': sum(row['seconds'] for row in self.rows),
+            'generated': sum(row['generated'] for row in self.rows),
+            'pruned': sum(row['pruned'] for row in self.rows),
+            'max_S_size': max((row['S_size'] for row in self.rows), default=0),
+            'max_G_size': max((row['G_size'] for row in self.rows), default=0),
+            'calls': dict(self.calls),
+        }
+
+    def export(self, path, format=None):
+        """
+        Writes the trace to a file.
+
+        Args:
+            path (str): The output file.
+            format (str, optional): 'json' for the summary and every row, or
+                'csv' for one line per row; defaults to the file extension.
+        """
+        format = format or ('csv' if Path(path).suffix.lower() == '.csv' else 'json')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            if format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=ROW_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.rows)
+            elif format == 'json':
+                json.dump({'summary': self.summary(), 'rows': self.rows}, f, indent=2)
+            else:
+                raise ValueError(f"Unknown trace format '{format}'")
@@ -1,22 +1,306 @@
-import pandas as pd
+import csv
+import gc
+import os
+import sys
 
-def load_data(data_path):
+from boundary_index import GeneralityIndex
+
+# pandas, numpy and the process pool are imported inside the functions that
+# need them, so the algorithm and the csv loader start without them.
+
+# Below this size an all-pairs scan is cheaper than building a GeneralityIndex.
+INDEX_MIN_SIZE = 32
+# Below this many G members to expand, a parallel expansion costs more in
+# pickling and scheduling than it saves.
+PARALLEL_MIN_SIZE = 256
+# Number of examples between two progress reports in learn().
+PROGRESS_EVERY = 1000
+# Bump whenever a change can alter the learned S or G, so cached results of
+# older versions are not reused.
+ALGORITHM_VERSION = 1
+
+# Cells read_csv treats as missing by default, and the values it parses as booleans.
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+TRUE_VALUES = frozenset(['True', 'TRUE', 'true'])
+FALSE_VALUES = frozenset(['False', 'FALSE', 'false'])
+# With engine='auto', files up to this size are read with the csv module; for
+# larger ones pandas' C parser repays the cost of importing it.
+CSV_ENGINE_MAX_BYTES = 4 * 1024 * 1024
+# The one missing value of the csv loader, so a column's domain holds a single NaN.
+NAN = float('nan')
+
+
+class LearningCancelled(Exception):
+    """Raised by learn() when its cancel event is set."""
+
+    def __init__(self, rows_processed):
+        super().__init__(f"Learning cancelled after {rows_processed} rows")
+        self.rows_processed = rows_processed
+
+
+class Table:
+    """Rows of a CSV file read by the csv loader, with the column names"""
+
+    def __init__(self, columns, rows):
+        """
+        Args:
+            columns (list): The column names.
+            rows (list): One list of values per row, in column order.
+        """
+        self.columns = list(columns)
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+
+def _is_dataframe(data):
+    """Checks for a pandas DataFrame without importing pandas."""
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(data, pandas.DataFrame)
+
+
+def _parse_values(strings, has_missing=False):
     """
-    # data must be in the form of a CSV file
-    # data must have the last column as the target column
-    # target column must have values 'Yes' or 'No'
+    Parses the distinct non-missing cells of a column as read_csv would.
+
+    Args:
+        strings (list): The distinct cells, as strings.
+        has_missing (bool): Whether the column also has missing cells, which
+            turns integers into floats.
+
+    Returns:
+        list: The parsed values, one per string: ints, floats or booleans
+              when every string parses as such, otherwise the strings.
+    """
+    if any('_' in value for value in strings):
+        return list(strings)
+    try:
+        values = [int(value) for value in strings]
+        return [float(value) for value in values] if has_missing else values
+    except ValueError:
+        pass
+    try:
+        return [float(value) for value in strings]
+    except ValueError:
+        pass
+    if all(value in TRUE_VALUES or value in FALSE_VALUES for value in strings):
+        return [value in TRUE_VALUES for value in strings]
+    return list(strings)
+
+
+def parse_cells(distinct):
+    """
+    Maps the distinct cells of a column to the values read_csv would give them.
+
+    Args:
+        distinct (list): The distinct cells of a column, as strings.
+
+    Returns:
+        dict: The value of each cell; missing cells map to NAN.
+    """
+    present = [value for value in distinct if value not in NA_VALUES]
+    parsed = dict(zip(present, _parse_values(present, len(present) != len(distinct))))
+    parsed.update((value, NAN) for value in distinct if value in NA_VALUES)
+    return parsed
+
+
+def _open_csv(data_path):
+    """Opens a path for reading, or returns an already open text file."""
+    if hasattr(data_path, 'read'):
+        return data_path, False
+    # utf-8-sig drops the byte order mark that spreadsheet exports put first.
+    return open(data_path, 'r', encoding='utf-8-sig', newline=''), True
+
+
+def _csv_header(data_path):
+    """Reads the column names of a CSV file, rewinding an open file."""
+    f, owned = _open_csv(data_path)
+    try:
+        header = next(csv.reader(f), [])
+    finally:
+        if owned:
+            f.close()
+        else:
+            f.seek(0)
+    return header
+
+
+def _read_csv_table(data_path, columns=None):
+    """
+    Reads a CSV file with the csv module, typing values like read_csv.
+
+    Each column's distinct cells are collected in order of first appearance
+    and parsed once, so the column domains come out of the same pass. The
+    cyclic garbage collector is paused while the rows are built: it would
+    otherwise rescan the growing list of rows over and over.
+
+    Args:
+        data_path (str or file): The path to the CSV file, or an open text file.
+        columns (list, optional): Names of the columns to keep, in order.
+
+    Returns:
+        tuple: The Table and the unique values per column.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    f, owned = _open_csv(data_path)
+    try:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        records = [record for record in reader if record]
+        width = len(header)
+        for i, record in enumerate(records):
+            if len(record) != width:
+                records[i] = (record + [''] * width)[:width]
+        indices = list(range(width)) if columns is None else [header.index(column) for column in columns]
+        cells = list(zip(*records)) if records else [()] * width
+        typed_columns = []
+        unique_values = []
+        unchanged = indices == list(range(width))
+        for i in indices:
+            column = cells[i]
+            distinct = list(dict.fromkeys(column))
+            parsed = parse_cells(distinct)
+            unique_values.append(list(dict.fromkeys(parsed[value] for value in distinct)))
+            if all(parsed[value] is value for value in distinct):
+                typed_columns.append(column)
+            else:
+                typed_columns.append([parsed[value] for value in column])
+                unchanged = False
+        del cells
+        # The parsed records already are the rows when no column was typed or dropped.
+        rows = records if unchanged else [list(row) for row in zip(*typed_columns)]
+    finally:
+        if owned:
+            f.close()
+        if gc_enabled:
+            gc.enable()
+    return Table([header[i] for i in indices], rows), unique_values
+
+
+def _column_domain(column):
+    """
+    Lists the values of a column in order of first appearance, like Series.unique().
+
+    Categorical columns are read from their integer codes, so the strings
+    are not scanned again.
+    """
+    import pandas as pd
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return column.unique().tolist()
+    categories = column.cat.categories.tolist()
+    return [categories[code] if code >= 0 else NAN
+            for code in pd.unique(column.cat.codes.to_numpy())]
+
+
+def canonical_missing(values):
+    """Replaces every missing value (NaN compares unequal to itself) with NAN."""
+    return [NAN if value != value else value for value in values]
+
+
+def _typed_categories(column):
+    """
+    Restores the value types read_csv would infer for a categorical column.
+
+    read_csv parses categories as strings; numbers and booleans are turned
+    back into numbers and booleans, so values compare and print the same as
+    with a plain read. Distinct strings that parse to the same value, such
+    as '1' and '01' or 'true' and 'True', are merged into one category.
+    """
+    import numpy as np
+    import pandas as pd
+    categories = column.cat.categories.tolist()
+    typed = _parse_values(categories, bool(column.isna().any()))
+    if typed == categories:
+        return column
+    if len(set(typed)) == len(categories):
+        return column.cat.rename_categories(typed)
+    merged = list(dict.fromkeys(typed))
+    position = {value: i for i, value in enumerate(merged)}
+    # Code -1 (missing) indexes the trailing -1 and stays missing.
+    remap = np.array([position[value] for value in typed] + [-1], dtype=np.int64)
+    codes = remap[column.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, merged), index=column.index, name=column.name)
+
+
+def _read_categorical_csv(data_path, columns=None):
+    """Reads a CSV file with pandas, every selected column as a categorical."""
+    import pandas as pd
+    df = pd.read_csv(data_path, usecols=columns, dtype='category')
+    for column in df.columns:
+        df[column] = _typed_categories(df[column])
+    if columns is not None:
+        df = df[columns]
+    return df
+
+
+def load_data(data_path, feature_columns=None, label_column=None, engine='auto'):
+    """
+    # data must be in the form of a CSV file with a header row
+    # the target column is the last column unless label_column names it
+    # the positive and negative target values are chosen by the caller
     Loads data from a CSV file, extracts unique values from each column,
     and initializes the S0 and G0 hypotheses.
 
+    With engine='csv' a file is read with the csv module into a Table, which
+    needs no pandas import but only offers columns, rows and len();
+    extract_examples accepts it like a DataFrame. With engine='pandas' it is
+    read into a DataFrame of categorical columns instead: each value is
+    stored once per column and the rows hold small integer codes, which
+    suits very large files. The default, 'auto', uses the csv module for
+    open files and for files up to CSV_ENGINE_MAX_BYTES, so callers that
+    need a DataFrame pass engine='pandas'. Either way values are typed as
+    read_csv would type them, and the domains are in order of first
+    appearance.
+
     Args:
-        data_path (str): The path to the CSV file.
+        data_path (str, file or pandas.DataFrame): The path to the CSV file,
+            an open text file, or an already loaded DataFrame, which is used
+            as is without copying unless columns are selected.
+        feature_columns (list, optional): Names of the feature columns, in
+            order; defaults to every column but the label. Other columns are
+            not kept.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column. It is moved to the last position.
+        engine (str): 'auto', 'csv' or 'pandas', for files.
 
     Returns:
-        tuple: A tuple containing the DataFrame, unique values per column,
+        tuple: A tuple containing the Table or DataFrame, unique values per column,
                initial specific hypothesis (S0), and initial general hypothesis (G0).
+
+    Raises:
+        ValueError: If a selected column does not exist.
     """
-    df = pd.read_csv(data_path)
-    unique_values = [df[column].unique().tolist() for column in df.columns]
+    dataframe = _is_dataframe(data_path)
+    if engine == 'auto' and not dataframe:
+        small = hasattr(data_path, 'read') or os.path.getsize(data_path) <= CSV_ENGINE_MAX_BYTES
+        engine = 'csv' if small else 'pandas'
+    columns = None
+    if feature_columns is not None or label_column is not None:
+        available = data_path.columns.tolist() if dataframe else _csv_header(data_path)
+        if label_column is not None and label_column not in available:
+            raise ValueError(f"Label column '{label_column}' not found")
+        label = available[-1] if label_column is None else label_column
+        if feature_columns is None:
+            feature_columns = [column for column in available if column != label]
+        missing = [column for column in feature_columns if column not in available]
+        if missing:
+            raise ValueError(f"Feature columns not found: {missing}")
+        columns = [*feature_columns, label]
+    if dataframe or engine == 'pandas':
+        if dataframe:
+            df = data_path if columns is None else data_path[columns]
+        else:
+            df = _read_categorical_csv(data_path, columns)
+        unique_values = [_column_domain(df[column]) for column in df.columns]
+    elif engine == 'csv':
+        df, unique_values = _read_csv_table(data_path, columns)
+    else:
+        raise ValueError(f"Unknown engine '{engine}'")
     S0 = [None] * (len(unique_values)-1)
     G0 = ['?'] * (len(unique_values)-1)
     return df, unique_values, [S0], [G0]
@@ -83,9 +367,9 @@ def get_minimal_generalizations(h, x):
     """
     if len(h) != len(x):
         return []
-    if h==[None]*len(h):
+    if all(v is None for v in h):
         return [x]
-    generalization = h[:]
+    generalization = list(h)
     for i in range(len(h)):
         if h[i] == '?':
             generalization[i] = h[i]
@@ -119,6 +403,69 @@ def get_minimal_specializations(h, x, unique_values):
     return list_of_specializations
 
 
+def iter_minimal_specializations(h, x, unique_values, S):
+    """
+    Yields the minimal specializations of h that exclude x and cover some member of S.
+
+    Produces the same candidates, in the same order, as filtering
+    get_minimal_specializations with the test in trait_negative_hypothesis,
+    but the values allowed at each attribute are worked out from S up front,
+    so candidates that would be rejected are never built.
+
+    Args:
+        h (list): A hypothesis consistent with x.
+        x (list): The negative example.
+        unique_values (list): List of unique values for each attribute.
+        S (list): The current specific hypotheses.
+
+    Yields:
+        tuple: A minimal specialization of h.
+    """
+    n = len(h)
+    if len(x) != n:
+        return
+    open_positions = [i for i in range(n) if h[i] == '?' and x[i] != '?']
+    if not open_positions:
+        return
+    any_value = dict.fromkeys(open_positions, False)
+    allowed = {i: set() for i in open_positions}
+    for s in S:
+        if len(s) != n:
+            continue
+        consistent = is_consistent(h, s)
+        general = True
+        strict = 0
+        for a, b in zip(h, s):
+            if a == '?':
+                strict += b != '?'
+            elif a != b:
+                if b is not None:
+                    general = False
+                    break
+                strict += 1
+        if not (consistent or general):
+            continue
+        for i in open_positions:
+            value = s[i]
+            if value == '?':
+                # Covering s requires h to stay consistent with it.
+                any_value[i] = any_value[i] or consistent
+            elif value is None:
+                any_value[i] = any_value[i] or general
+            elif consistent or (general and strict > 1):
+                # '?' -> value at i stops being a strict step, so h must be
+                # strictly more general than s elsewhere.
+                allowed[i].add(value)
+    h = tuple(h)
+    for i in open_positions:
+        if not (any_value[i] or allowed[i]):
+            continue
+        head, tail = h[:i], h[i + 1:]
+        for item in unique_values[i]:
+            if item != x[i] and item != '?' and (any_value[i] or item in allowed[i]):
+                yield (*head, item, *tail)
+
+
 def remove_less_general(G):
     """
     Removes hypotheses from G that are less general than another hypothesis in G.
@@ -129,7 +476,10 @@ def remove_less_general(G):
     Returns:
         list: A list of hypotheses from G with less general hypotheses removed.
     """
-    return [g for g in G if not any(is_more_general(g1, g) and g1 != g for g1 in G)]
+    if len(G) < INDEX_MIN_SIZE:
+        return [g for g in G if not any(is_more_general(g1, g) and g1 != g for g1 in G)]
+    index = GeneralityIndex(G)
+    return [g for g in G if not index.has_more_general(g)]
 
 
 def remove_more_general(S):
@@ -142,7 +492,47 @@ def remove_more_general(S):
     Returns:
         list: A list of hypotheses from S with more general hypotheses removed.
     """
-    return [s for s in S if not any(is_more_general(s, s1) and s1 != s for s1 in S)]
+    if len(S) < INDEX_MIN_SIZE:
+        return [s for s in S if not any(is_more_general(s, s1) and s1 != s for s1 in S)]
+    index = GeneralityIndex(S)
+    return [s for s in S if not index.has_less_general(s)]
+
+
+def make_boundary(hypotheses):
+    """
+    Builds a boundary set from a list of hypotheses.
+
+    A boundary is a dict keyed by tuple hypotheses (values are unused), so it
+    keeps insertion order like a list while membership, removal and
+    deduplication are constant time.
+
+    Args:
+        hypotheses (iterable): The hypotheses, as lists or tuples.
+
+    Returns:
+        dict: The boundary set.
+    """
+    return dict.fromkeys(tuple(h) for h in hypotheses)
+
+
+def boundary_to_list(boundary):
+    """
+    Converts a boundary set back into a list of list-based hypotheses.
+
+    Args:
+        boundary (dict): The boundary set.
+
+    Returns:
+        list: The hypotheses, in boundary order.
+    """
+    return [list(h) for h in boundary]
+
+
+def _replace_boundary(boundary, hypotheses):
+    """Refills a boundary set in place, keeping the order of hypotheses."""
+    if len(hypotheses) != len(boundary):
+        boundary.clear()
+        boundary.update(dict.fromkeys(hypotheses))
 
 
 def trait_positive_hypothesis(row, S, G):
@@ -151,39 +541,379 @@ def trait_positive_hypothesis(row, S, G):
 
     Args:
         row (list): A positive training example.
-        S (list): The current specific hypotheses.
-        G (list): The current general hypotheses.
+        S (dict): The current specific boundary, from make_boundary.
+        G (dict): The current general boundary, from make_boundary.
     """
-    G[:] = [g for g in G if is_consistent(g, row)]
-    S_copy = S[:]
-    for s in S_copy:
-        if not is_consistent(s, row):
-            S.remove(s)
-            generalization = get_minimal_generalizations(s, row)
-            S.append(generalization[0])
-    S[:] = remove_more_general(S)
+    for g in [g for g in G if not is_consistent(g, row)]:
+        del G[g]
+    for s in [s for s in S if not is_consistent(s, row)]:
+        del S[s]
+        S[tuple(get_minimal_generalizations(s, row)[0])] = None
+    _replace_boundary(S, remove_more_general(list(S)))
+
+
+def _expand_shard(shard, row, unique_values, S):
+    """Computes the minimal specializations of a shard of G members."""
+    return [specialization for g in shard
+            for specialization in iter_minimal_specializations(g, row, unique_values, S)]
 
 
-def trait_negative_hypothesis(row, S, G, unique_values):
+def trait_negative_hypothesis(row, S, G, unique_values, executor=None, min_parallel=PARALLEL_MIN_SIZE):
     """
     Updates the specific and general hypotheses based on a negative training example.
 
+    The G members consistent with the example are expanded independently, so
+    when an executor is given and there are at least min_parallel of them,
+    they are sharded across its workers and the candidates merged in order
+    before the single pruning pass. Smaller expansions stay serial.
+
     Args:
         row (list): A negative training example.
-        S (list): The current specific hypotheses.
-        G (list): The current general hypotheses.
+        S (dict): The current specific boundary, from make_boundary.
+        G (dict): The current general boundary, from make_boundary.
         unique_values (list): List of unique values for each attribute.
+        executor (concurrent.futures.Executor, optional): Pool used for
+            large expansions.
+        min_parallel (int): Smallest number of G members to expand in parallel.
+    """
+    for s in [s for s in S if is_consistent(s, row)]:
+        del S[s]
+    consistent = [g for g in G if is_consistent(g, row)]
+    for g in consistent:
+        del G[g]
+    if executor is not None and len(consistent) >= min_parallel:
+        n_shards = 4 * (os.cpu_count() or 1)
+        shard_size = -(-len(consistent) // n_shards)
+        shards = [consistent[i:i + shard_size] for i in range(0, len(consistent), shard_size)]
+        boundary_S = list(S)
+        futures = [executor.submit(_expand_shard, shard, row, unique_values, boundary_S) for shard in shards]
+        for future in futures:
+            G.update(dict.fromkeys(future.result()))
+    else:
+        for g in consistent:
+            G.update(dict.fromkeys(iter_minimal_specializations(g, row, unique_values, S)))
+    _replace_boundary(G, remove_less_general(list(G)))
+
+
+def _object_values(column):
+    """Returns a column as an object array, decoding categoricals through their codes."""
+    import numpy as np
+    import pandas as pd
+    if not isinstance(column.dtype, pd.CategoricalDtype):
+        return column.to_numpy(dtype=object)
+    lookup = np.array([*column.cat.categories.tolist(), NAN], dtype=object)
+    return lookup[column.cat.codes.to_numpy()]
+
+
+def extract_examples(df, positive='Yes'):
+    """
+    Extracts the training examples of a Table or DataFrame in one pass.
+
+    The feature rows are pulled out as plain lists and the positive/negative
+    split is computed once from the last column, so the learning loop does
+    not build a pandas Series per row.
+
+    Args:
+        df (Table or pandas.DataFrame): The data, with the target as the last column.
+        positive: The target value marking a positive example.
+
+    Returns:
+        iterator: (row, is_positive) pairs, where row is a list of feature values.
     """
-    S[:] = [s for s in S if not is_consistent(s, row)]
-    G_copy = G[:]
-    for g in G_copy:
-        if is_consistent(g, row):
-            G.remove(g)
-            for specialization in get_minimal_specializations(g, row, unique_values):
-                if (not is_consistent(specialization, row) and 
-                    any(is_consistent(specialization, s) or is_more_general(specialization, s) for s in S)):
-                    G.append(specialization)
-    G[:] = remove_less_general(G)
+    if isinstance(df, Table):
+        return ((row[:-1], row[-1] == positive) for row in df.rows)
+    import numpy as np
+    import pandas as pd
+    features = df.iloc[:, :-1]
+    if any(isinstance(dtype, pd.CategoricalDtype) for dtype in features.dtypes):
+        rows = np.column_stack([_object_values(features.iloc[:, i])
+                                for i in range(features.shape[1])]).tolist()
+    else:
+        rows = features.to_numpy(dtype=object).tolist()
+    labels = (df.iloc[:, -1] == positive).tolist()
+    return zip(rows, labels)
+
+
+def collapse_duplicates(examples):
+    """
+    Collapses repeated examples into their first occurrence.
+
+    Learning an example a second time cannot shrink the version space, so
+    only the first occurrence of each (features, label) pair is kept, in
+    order. In rare cases the boundaries this module computes still differ
+    from those of a run over every row, which is why collapsing is opt-in.
+    Feature rows seen with both labels are reported as contradictions:
+    no conjunctive hypothesis fits them, so the version space will collapse.
+
+    Args:
+        examples (iterable): (row, is_positive) pairs, as from extract_examples.
+
+    Returns:
+        tuple: The unique examples as a list, and a report dict with the
+               'examples', 'unique' and 'duplicates' counts and the
+               'contradictions' (feature rows seen with both labels).
+    """
+    unique = {}
+    total = 0
+    for row, positive in examples:
+        total += 1
+        unique.setdefault((tuple(row), bool(positive)), None)
+    labels = {}
+    contradictions = []
+    for row, positive in unique:
+        if labels.setdefault(row, positive) != positive:
+            contradictions.append(list(row))
+    report = {
+        'examples': total,
+        'unique': len(unique),
+        'duplicates': total - len(unique),
+        'contradictions': contradictions,
+    }
+    return [(list(row), positive) for row, positive in unique], report
+
+
+def learn(examples, S, G, unique_values, executor=None, progress=None, cancel=None,
+          progress_every=PROGRESS_EVERY, stop_on_collapse=False):
+    """
+    Updates the hypotheses with a stream of training examples.
+
+    Args:
+        examples (iterable): (row, is_positive) pairs, as from extract_examples.
+        S (list or dict): The current specific hypotheses, or a boundary set.
+        G (list or dict): The current general hypotheses, or a boundary set.
+        unique_values (list): List of unique values for each attribute.
+        executor (concurrent.futures.Executor, optional): Pool used to expand
+            large G boundaries in parallel; see trait_negative_hypothesis.
+        progress (callable, optional): Called as progress(rows, |S|, |G|)
+            every progress_every examples and once at the end.
+        cancel (threading.Event, optional): Checked after every example;
+            when set, learning stops.
+        progress_every (int): Number of examples between progress reports.
+        stop_on_collapse (bool): Stop as soon as S or G is empty. The version
+            space is then empty and stays so, but the remaining examples
+            would still have reshaped the other boundary.
+
+    Returns:
+        dict: The 'status' ('complete', or 'collapsed' if learning stopped
+              on an empty boundary) and the number of 'rows' learned.
+
+    Raises:
+        LearningCancelled: If cancel was set. S and G are then left as they
+            were, unless they were passed as boundary sets.
+    """
+    boundary_S = S if isinstance(S, dict) else make_boundary(S)
+    boundary_G = G if isinstance(G, dict) else make_boundary(G)
+    rows = 0
+    status = 'complete'
+    for row, positive in examples:
+        if positive:
+            trait_positive_hypothesis(row, boundary_S, boundary_G)
+        else:
+            trait_negative_hypothesis(row, boundary_S, boundary_G, unique_values, executor)
+        rows += 1
+        if progress is not None or cancel is not None:
+            if cancel is not None and cancel.is_set():
+                raise LearningCancelled(rows)
+            if progress is not None and rows % progress_every == 0:
+                progress(rows, len(boundary_S), len(boundary_G))
+        if stop_on_collapse and not (boundary_S and boundary_G):
+            status = 'collapsed'
+            break
+    if progress is not None and rows % progress_every:
+        progress(rows, len(boundary_S), len(boundary_G))
+    if boundary_S is not S:
+        S[:] = boundary_to_list(boundary_S)
+    if boundary_G is not G:
+        G[:] = boundary_to_list(boundary_G)
+    return {'status': status, 'rows': rows}
+
+
+def extract_labelled(df):
+    """
+    Extracts the feature rows of a Table or DataFrame with their raw target values.
+
+    Args:
+        df (Table or pandas.DataFrame): The data, with the target as the last column.
+
+    Returns:
+        iterator: (row, target) pairs, where row is a list of feature values.
+    """
+    if isinstance(df, Table):
+        return ((row[:-1], row[-1]) for row in df.rows)
+    rows = extract_examples(df)
+    return zip((row for row, positive in rows), _object_values(df.iloc[:, -1]).tolist())
+
+
+def learn_one_vs_rest(examples, unique_values, classes, progress=None, cancel=None,
+                      progress_every=PROGRESS_EVERY):
+    """
+    Learns one version space per class in a single pass over the examples.
+
+    Each example is a positive example of the class its target equals and a
+    negative example of every other class, so the boundaries of a class are
+    those learn gives with that class as the positive indicator. Rows are
+    parsed once and shared by every class.
+
+    Args:
+        examples (iterable): (row, target) pairs, as from extract_labelled.
+        unique_values (list): List of unique values for each attribute.
+        classes (list): The target values to learn a version space for.
+        progress (callable, optional): Called as progress(rows, classes,
+            collapsed) every progress_every examples and once at the end,
+            collapsed being the number of classes with an empty boundary.
+        cancel (threading.Event, optional): Checked after every example;
+            when set, learning stops.
+        progress_every (int): Number of examples between progress reports.
+
+    Returns:
+        dict: Maps each class to its final S and G, as lists of list-based
+              hypotheses.
+
+    Raises:
+        LearningCancelled: If cancel was set.
+    """
+    n = len(unique_values)
+    boundaries = {c: (make_boundary([[None] * n]), make_boundary([['?'] * n])) for c in classes}
+    items = list(boundaries.items())
+    rows = 0
+    for row, target in examples:
+        for c, (S, G) in items:
+            if target == c:
+                trait_positive_hypothesis(row, S, G)
+            else:
+                trait_negative_hypothesis(row, S, G, unique_values)
+        rows += 1
+        if progress is not None or cancel is not None:
+            if cancel is not None and cancel.is_set():
+                raise LearningCancelled(rows)
+            if progress is not None and rows % progress_every == 0:
+                progress(rows, len(items), sum(not (S and G) for c, (S, G) in items))
+    if progress is not None and rows % progress_every:
+        progress(rows, len(items), sum(not (S and G) for c, (S, G) in items))
+    return {c: (boundary_to_list(S), boundary_to_list(G)) for c, (S, G) in items}
+
+
+def select_classes(targets, classes=None):
+    """
+    Picks the classes to learn one-vs-rest from a target column.
+
+    Args:
+        targets (list): The unique values of the target column.
+        classes (list, optional): The requested classes; defaults to every
+            non-missing target value, in order of first appearance.
+
+    Returns:
+        list: The classes.
+
+    Raises:
+        ValueError: If a requested class does not occur in the target column.
+    """
+    if classes is None:
+        return [c for c in targets if c == c]
+    missing = [c for c in classes if c not in targets]
+    if missing:
+        raise ValueError(f"Classes not found in target column: {missing}")
+    return list(classes)
+
+
+def run_one_vs_rest(data_path, classes=None, label_column=None, feature_columns=None,
+                    progress=None, cancel=None):
+    """
+    Learns one version space per class of a CSV file's target column.
+
+    Args:
+        data_path (str or pandas.DataFrame): The path to the CSV file, or an
+            already loaded DataFrame.
+        classes (list, optional): The target values to learn; see select_classes.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column.
+        feature_columns (list, optional): Names of the feature columns to
+            learn from; defaults to every column but the label.
+        progress (callable, optional): Progress callback; see learn_one_vs_rest.
+        cancel (threading.Event, optional): Cancellation event; see learn.
+
+    Returns:
+        dict: Maps each class to its final S and G, as lists of list-based
+              hypotheses.
+
+    Raises:
+        ValueError: If a selected column or a requested class is missing.
+        LearningCancelled: If cancel was set during learning.
+    """
+    df, unique_values, S, G = load_data(data_path, feature_columns, label_column)
+    classes = select_classes(unique_values[-1] if unique_values else [], classes)
+    return learn_one_vs_rest(extract_labelled(df), unique_values[:-1], classes, progress, cancel)
+
+
+def scan_domains(data_path, chunksize=100_000):
+    """
+    Collects the unique values of each column with a chunked pass over a CSV file.
+
+    Only one chunk and the per-column domains are held in memory, so the
+    cost is independent of the number of rows.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        chunksize (int): Number of rows read per chunk.
+
+    Returns:
+        list: List of unique values for each column, in order of first appearance.
+    """
+    import pandas as pd
+    domains = None
+    for chunk in pd.read_csv(data_path, chunksize=chunksize):
+        if domains is None:
+            domains = [{} for _ in chunk.columns]
+        for domain, column in zip(domains, chunk.columns):
+            # Every chunk brings its own NaN object; collapse them into one key.
+            domain.update(dict.fromkeys(canonical_missing(chunk[column].unique().tolist())))
+    return [list(domain) for domain in domains or []]
+
+
+def learn_stream(data_path, schema=None, chunksize=100_000, positive='Yes'):
+    """
+    Learns S and G from a CSV file read in chunks, without loading it whole.
+
+    Args:
+        data_path (str): The path to the CSV file.
+        schema (dict, optional): Maps each feature column name to its list of
+            values. When omitted the domains are taken from a first pass with
+            scan_domains, so the file is read twice.
+        chunksize (int): Number of rows read per chunk.
+        positive: The target value marking a positive example.
+
+    Returns:
+        tuple: The unique values per feature, and the final S and G.
+
+    Raises:
+        ValueError: If the schema misses a feature column, or the data holds
+            a value the schema does not declare.
+    """
+    import pandas as pd
+    unique_values = scan_domains(data_path, chunksize)[:-1] if schema is None else None
+    S = G = None
+    for chunk in pd.read_csv(data_path, chunksize=chunksize):
+        features = chunk.columns[:-1]
+        if S is None:
+            if schema is not None:
+                missing = [column for column in features if column not in schema]
+                if missing:
+                    raise ValueError(f"Schema has no domain for columns: {missing}")
+                unique_values = [canonical_missing(schema[column]) for column in features]
+            S = make_boundary([[None] * len(features)])
+            G = make_boundary([['?'] * len(features)])
+        if schema is not None:
+            for column, values in zip(features, unique_values):
+                unknown = set(canonical_missing(chunk[column].unique().tolist())).difference(values)
+                if unknown:
+                    raise ValueError(f"Column '{column}' has values not in the schema: {sorted(map(str, unknown))}")
+        examples = extract_examples(chunk, positive)
+        if chunk[features].isna().to_numpy().any():
+            examples = ((canonical_missing(row), label) for row, label in examples)
+        learn(examples, S, G, unique_values)
+    if S is None:
+        return unique_values, [], []
+    return unique_values, boundary_to_list(S), boundary_to_list(G)
 
 
 def trait_row(row, S, G, unique_values):
@@ -191,31 +921,135 @@ def trait_row(row, S, G, unique_values):
     Processes a single row from the dataset to update the hypotheses.
 
     Args:
-        row (pandas.Series): A row from the DataFrame.
-        S (list): The current specific hypotheses.
-        G (list): The current general hypotheses.
+        row (pandas.Series or list): A row from the DataFrame or Table.
+        S (list or dict): The current specific hypotheses, or a boundary set.
+        G (list or dict): The current general hypotheses, or a boundary set.
         unique_values (list): List of unique values for each attribute.
     """
-    row = row.tolist()
-    if row[-1] == 'Yes':
-        trait_positive_hypothesis(row[:-1], S, G)
-    else:
-        trait_negative_hypothesis(row[:-1], S, G, unique_values)
+    row = row.tolist() if hasattr(row, 'tolist') else list(row)
+    learn([(row[:-1], row[-1] == 'Yes')], S, G, unique_values)
+
+
+def check_indicators(targets, positive, negative):
+    """
+    Checks that both class indicators occur in the target column.
+
+    Args:
+        targets (list): The unique values of the target column.
+        positive: The target value marking a positive example.
+        negative: The target value marking a negative example.
+
+    Raises:
+        ValueError: If either indicator does not occur in the target column.
+    """
+    if positive not in targets:
+        raise ValueError(f"Positive indicator '{positive}' not found in target column")
+    if negative not in targets:
+        raise ValueError(f"Negative indicator '{negative}' not found in target column")
+
+
+def run(data_path, positive='Yes', negative='No', label_column=None, progress=None, cancel=None,
+        feature_columns=None):
+    """
+    Learns the final S and G of a CSV file with custom class indicators.
+
+    Rows whose target equals positive are positive examples; every other row
+    is negative, as in trait_row.
+
+    Args:
+        data_path (str or pandas.DataFrame): The path to the CSV file, or an
+            already loaded DataFrame.
+        positive: The target value marking a positive example.
+        negative: The target value marking a negative example.
+        label_column (str, optional): Name of the target column; defaults
+            to the last column.
+        progress (callable, optional): Progress callback; see learn.
+        cancel (threading.Event, optional): Cancellation event; see learn.
+        feature_columns (list, optional): Names of the feature columns to
+            learn from; defaults to every column but the label.
+
+    Returns:
+        tuple: The final S and G, as lists of list-based hypotheses.
+
+    Raises:
+        ValueError: If a selected column or either indicator is missing.
+        LearningCancelled: If cancel was set during learning.
+    """
+    df, unique_values, S, G = load_data(data_path, feature_columns, label_column)
+    check_indicators(unique_values[-1] if unique_values else [], positive, negative)
+    learn(extract_examples(df, positive), S, G, unique_values, progress=progress, cancel=cancel)
+    return S, G
+
+
+def format_boundaries(S, G):
+    """
+    Formats the final boundaries the way main() prints them.
 
+    Args:
+        S (list): The final specific hypotheses.
+        G (list): The final general hypotheses.
+
+    Returns:
+        str: The 'Final S:' and 'Final G:' lines.
+    """
+    return f"Final S: {S}\nFinal G: {G}\n"
+
+
+def format_collapse_report(report, result):
+    """
+    Describes the duplicate collapsing and the learning status of a run.
 
-def main(data_path):
+    Args:
+        report (dict): The report from collapse_duplicates.
+        result (dict): The status returned by learn.
+
+    Returns:
+        str: One line per finding.
+    """
+    lines = [f"Collapsed {report['duplicates']} duplicate examples: "
+             f"{report['unique']} unique of {report['examples']}"]
+    contradictions = report['contradictions']
+    if contradictions:
+        shown = ', '.join(str(row) for row in contradictions[:5])
+        more = f" and {len(contradictions) - 5} more" if len(contradictions) > 5 else ""
+        lines.append(f"Contradictions ({len(contradictions)}): {shown}{more}")
+    if result['status'] == 'collapsed':
+        lines.append(f"Version space collapsed after {result['rows']} of {report['unique']} "
+                     f"unique examples; the remaining examples were skipped")
+    return '\n'.join(lines) + '\n'
+
+
+def main(data_path, chunksize=None, workers=None, collapse=False):
     """
     Main function to execute the Candidate Elimination algorithm.
 
     Args:
         data_path (str): The path to the CSV file.
+        chunksize (int, optional): When given, stream the file in chunks of
+            this many rows instead of loading it into memory.
+        workers (int, optional): When given, expand large G boundaries across
+            this many worker processes.
+        collapse (bool): Learn each distinct example once and stop as soon
+            as the version space collapses, then report both; the file is
+            then loaded whole and learned serially.
     """
-    df, unique_values, S, G = load_data(data_path)
-    for index, row in df.iterrows():
-        trait_row(row, S, G, unique_values)
+    if collapse:
+        df, unique_values, S, G = load_data(data_path)
+        examples, report = collapse_duplicates(extract_examples(df))
+        result = learn(examples, S, G, unique_values, stop_on_collapse=True)
+        print(format_collapse_report(report, result), end='')
+    elif chunksize:
+        unique_values, S, G = learn_stream(data_path, chunksize=chunksize)
+    elif workers:
+        from concurrent.futures import ProcessPoolExecutor
+        df, unique_values, S, G = load_data(data_path)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            learn(extract_examples(df), S, G, unique_values, executor)
+    else:
+        df, unique_values, S, G = load_data(data_path)
+        learn(extract_examples(df), S, G, unique_values)
 
-    print('Final S:', S)
-    print('Final G:', G)
+    print(format_boundaries(S, G), end='')
     
 
 if __name__ == '__main__':
@@ -0,0 +1,110 @@
+"""
+Content-addressed cache of learned boundaries.
+
+Results are keyed by a SHA-256 of the data file's bytes, the positive and
+negative indicators and main.ALGORITHM_VERSION, so re-processing an identical
+job returns the stored S and G without learning. Each entry is a small JSON
+file whose modification time records its last use; once the cache exceeds
+its size limit the least recently used entries are evicted.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from main import ALGORITHM_VERSION
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_READ_BLOCK = 1 << 20
+
+
+class ResultCache:
+    """LRU cache of S and G keyed by data content and indicators"""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Directory holding the cache entries; created if needed.
+            max_bytes (int): Size limit of all entries together.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(data_path, positive, negative):
+        """
+        Computes the cache key of a job.
+
+        Args:
+            data_path (str): The path to the CSV file.
+            positive: The positive indicator.
+            negative: The negative indicator.
+
+        Returns:
+            str: A hex digest.
+        """
+        digest = hashlib.sha256()
+        with open(data_path, 'rb') as f:
+            for block in iter(lambda: f.read(_READ_BLOCK), b''):
+                digest.update(block)
+        digest.update(b'\0')
+        digest.update(json.dumps([str(positive), str(negative), ALGORITHM_VERSION]).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """
+        Looks up a job and marks it as recently used.
+
+        Args:
+            key (str): A key from ResultCache.key.
+
+        Returns:
+            tuple: The stored S and G, or None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry['S'], entry['G']
+
+    def put(self, key, S, G):
+        """
+        Stores the result of a job, then evicts old entries over the size limit.
+
+        Args:
+            key (str): A key from ResultCache.key.
+            S (list): The final specific hypotheses.
+            G (list): The final general hypotheses.
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'S': S, 'G': G}, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits its size limit."""
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
@@ -1,20 +1,61 @@
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import queue
+import threading
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
 from io import StringIO
+import bitset
+import batch
+import benchmark
+import cli
+import columnar
+from classify import classify, classify_csv
+import encoded
+import evaluate
+import main
+from instrumentation import Instrumentation
+from history_store import HistoryStore
+from result_cache import ResultCache
+from boundary_index import GeneralityIndex
+from version_space import VersionSpace
 from main import (
     load_data, is_consistent, is_more_general, get_minimal_generalizations,
-    get_minimal_specializations, remove_less_general, remove_more_general
+    get_minimal_specializations, remove_less_general, remove_more_general, trait_row,
+    extract_examples, learn, scan_domains, learn_stream, iter_minimal_specializations,
+    make_boundary, boundary_to_list, trait_negative_hypothesis, run, LearningCancelled,
+    collapse_duplicates, run_one_vs_rest
 )
 
-class TestCandidateElimination(unittest.TestCase):
-    def setUp(self):
-        csv_data = """Outlook,Temperature,Humidity,Wind,Play
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Most seconds `import main, cli` may take in a fresh interpreter, best of
+# IMPORT_BUDGET_RUNS runs; importing pandas alone takes longer than this.
+IMPORT_BUDGET_SECONDS = 0.2
+IMPORT_BUDGET_RUNS = 5
+WEATHER_CSV = """Outlook,Temperature,Humidity,Wind,Play
 Sunny,Hot,High,Weak,No
 Sunny,Hot,High,Strong,No
 Overcast,Hot,High,Weak,Yes
 Rain,Mild,High,Weak,Yes
 Rain,Cool,Normal,Weak,Yes"""
-        self.df = pd.read_csv(StringIO(csv_data))
+
+
+def reference_run(data):
+    """Runs the list-based reference loop and returns the final S and G."""
+    df, unique_values, S, G = load_data(data, engine='pandas')
+    for index, row in df.iterrows():
+        trait_row(row, S, G, unique_values)
+    return S, G
+
+
+class TestCandidateElimination(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.read_csv(StringIO(WEATHER_CSV))
         self.unique_values = [self.df[column].unique().tolist() for column in self.df.columns]
         self.S0 = [None] * (len(self.unique_values)-1)
         self.G0 = ['?'] * (len(self.unique_values)-1)
@@ -44,6 +85,21 @@ Rain,Cool,Normal,Weak,Yes"""
         self.assertIn(['Overcast', 'Hot', '?', '?'], result)
         self.assertIn(['Rain', 'Hot', '?', '?'], result)
     
+    def test_iter_minimal_specializations_matches_filtered_reference(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            n = rng.randint(1, 4)
+            domains = [['a', 'b', 'c'][:rng.randint(1, 3)] for _ in range(n)]
+            x = [rng.choice(d) for d in domains]
+            g = [rng.choice(d + ['?', '?']) for d in domains]
+            if not is_consistent(g, x):
+                continue
+            S = [[rng.choice(d + ['?', None]) for d in domains] for _ in range(rng.randint(0, 3))]
+            expected = [h for h in get_minimal_specializations(g, x, domains)
+                        if not is_consistent(h, x) and any(is_consistent(h, s) or is_more_general(h, s) for s in S)]
+            result = [list(h) for h in iter_minimal_specializations(g, x, domains, S)]
+            self.assertEqual(result, expected)
+
     def test_remove_less_general(self):
         G = [['?', '?', '?', '?'], ['Sunny', '?', '?', '?']]
         self.assertEqual(remove_less_general(G), [['Sunny', '?', '?', '?']])
@@ -52,5 +108,708 @@ Rain,Cool,Normal,Weak,Yes"""
         S = [['Sunny', 'Hot', '?', '?'], ['Sunny', '?', '?', '?']]
         self.assertEqual(remove_more_general(S), [['Sunny', 'Hot', '?', '?']])
 
+    def test_boundary_deduplicates(self):
+        boundary = make_boundary([['Sunny', '?'], ('Sunny', '?'), ['?', 'Hot']])
+        self.assertEqual(boundary_to_list(boundary), [['Sunny', '?'], ['?', 'Hot']])
+
+    def test_negative_example_updates_boundaries_in_place(self):
+        S, G = make_boundary([['Sunny', 'Hot', 'High', 'Weak']]), make_boundary([['?', '?', '?', '?']])
+        trait_negative_hypothesis(['Rain', 'Hot', 'High', 'Weak'], S, G, self.unique_values[:-1])
+        self.assertEqual(list(G), [('Sunny', '?', '?', '?')])
+        self.assertEqual(list(S), [('Sunny', 'Hot', 'High', 'Weak')])
+
+    def test_parallel_expansion_matches_serial(self):
+        rng = random.Random(0)
+        domains = [[f"v{j}" for j in range(4)] for _ in range(6)]
+        rows = [[rng.choice(d) for d in domains] for _ in range(4)]
+        results = []
+        with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as processes:
+            for executor in (None, threads, processes):
+                S, G = make_boundary([[None] * 6]), make_boundary([['?'] * 6])
+                for row in rows:
+                    trait_negative_hypothesis(row, S, G, domains, executor, min_parallel=1)
+                results.append(list(G))
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+
+    def test_extract_examples(self):
+        examples = list(extract_examples(self.df))
+        self.assertEqual(examples[0], (['Sunny', 'Hot', 'High', 'Weak'], False))
+        self.assertEqual(examples[2], (['Overcast', 'Hot', 'High', 'Weak'], True))
+
+    def test_learn_matches_iterrows_loop(self):
+        for name in ('data.csv', 'driving_behavior.csv'):
+            path = os.path.join(HERE, name)
+            df, unique_values, S, G = load_data(path)
+            learn(extract_examples(df), S, G, unique_values)
+            self.assertEqual((S, G), reference_run(path))
+
+    def test_load_data_engines_match_plain_read(self):
+        numbers = "a,b,flag,label\n1,1.5,True,Yes\n2,,False,No\n1,2.5,True,Yes\n"
+        for engine in ('csv', 'pandas'):
+            for name in ('data.csv', 'driving_behavior.csv'):
+                path = os.path.join(HERE, name)
+                df, unique_values, S, G = load_data(path, engine=engine)
+                plain = pd.read_csv(path)
+                self.assertEqual(unique_values, [plain[column].unique().tolist() for column in plain.columns])
+                self.assertEqual([row for row, _ in extract_examples(df)],
+                                 plain.iloc[:, :-1].values.tolist())
+            df, unique_values, S, G = load_data(StringIO(numbers), engine=engine)
+            self.assertEqual((unique_values[0], unique_values[2]), ([1, 2], [True, False]))
+            self.assertEqual(unique_values[1][::2], [1.5, 2.5])
+            self.assertTrue(pd.isna(unique_values[1][1]))
+            self.assertEqual([row for row, _ in extract_examples(df)][0], [1, 1.5, True])
+            # Spellings of one value share a single domain entry.
+            df, unique_values, S, G = load_data(StringIO("a,b,y\n1,true,Yes\n01,True,No\n"), engine=engine)
+            self.assertEqual(unique_values[:2], [[1], [True]])
+            self.assertEqual([row for row, _ in extract_examples(df)], [[1, True], [1, True]])
+        self.assertEqual(run(StringIO(numbers)), ([[1, '?', True]], [[1, '?', '?'], ['?', '?', True]]))
+
+    def test_core_import_time_budget(self):
+        # The algorithm and its csv loader must start without pandas.
+        code = ("import sys, time; start = time.perf_counter(); import main, cli; "
+                "seconds = time.perf_counter() - start; "
+                "main.load_data(sys.argv[1]); "
+                "print(seconds, 'pandas' in sys.modules, 'numpy' in sys.modules)")
+        timings = []
+        for _ in range(IMPORT_BUDGET_RUNS):
+            output = subprocess.run([sys.executable, '-c', code, 'data.csv'], cwd=HERE, capture_output=True,
+                                    text=True, check=True).stdout.split()
+            self.assertEqual(output[1:], ['False', 'False'])
+            timings.append(float(output[0]))
+        self.assertLess(min(timings), IMPORT_BUDGET_SECONDS)
+        self.assertIsInstance(load_data(StringIO(WEATHER_CSV))[0], main.Table)
+        self.assertIsInstance(load_data(StringIO(WEATHER_CSV), engine='pandas')[0], pd.DataFrame)
+
+    def test_load_data_selects_columns(self):
+        df, unique_values, S, G = load_data(StringIO(WEATHER_CSV), ['Wind', 'Outlook'], 'Humidity')
+        self.assertEqual(df.columns, ['Wind', 'Outlook', 'Humidity'])
+        self.assertEqual(unique_values, [['Weak', 'Strong'], ['Sunny', 'Overcast', 'Rain'], ['High', 'Normal']])
+        self.assertEqual(S, [[None] * 2])
+        df, unique_values, S, G = load_data(StringIO(WEATHER_CSV), label_column='Outlook')
+        self.assertEqual(df.columns, ['Temperature', 'Humidity', 'Wind', 'Play', 'Outlook'])
+        with self.assertRaises(ValueError):
+            load_data(StringIO(WEATHER_CSV), ['Pressure'])
+        with self.assertRaises(ValueError):
+            load_data(pd.read_csv(StringIO(WEATHER_CSV)), label_column='Pressure')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bom.csv')
+            with open(path, 'w', encoding='utf-8-sig') as f:
+                f.write(WEATHER_CSV)
+            for engine in ('csv', 'pandas'):
+                df, unique_values, S, G = load_data(path, ['Outlook'], 'Play', engine=engine)
+                self.assertEqual(list(df.columns), ['Outlook', 'Play'])
+
+    def test_collapse_duplicates(self):
+        examples = [(['a', 'x'], True), (['b', 'y'], False), (['a', 'x'], True),
+                    (['b', 'y'], True), (['a', 'x'], True)]
+        unique, report = collapse_duplicates(examples)
+        self.assertEqual(unique, [(['a', 'x'], True), (['b', 'y'], False), (['b', 'y'], True)])
+        self.assertEqual((report['examples'], report['unique'], report['duplicates']), (5, 3, 2))
+        self.assertEqual(report['contradictions'], [['b', 'y']])
+
+    def test_learn_stops_on_collapse(self):
+        df, unique_values, S, G = load_data(StringIO(WEATHER_CSV))
+        result = learn(extract_examples(df), S, G, unique_values, stop_on_collapse=True)
+        self.assertEqual(result, {'status': 'collapsed', 'rows': 4})
+        self.assertEqual(G, [])
+        df, unique_values, S, G = load_data(os.path.join(HERE, 'driving_behavior.csv'))
+        result = learn(extract_examples(df), S, G, unique_values, stop_on_collapse=True)
+        self.assertEqual(result, {'status': 'complete', 'rows': 4})
+        self.assertEqual((S, G), reference_run(os.path.join(HERE, 'driving_behavior.csv')))
+
+    def test_one_vs_rest_matches_per_class_runs(self):
+        rng = random.Random(5)
+        rows = [[rng.choice('ab') for _ in range(4)] for _ in range(40)]
+        df = pd.DataFrame([row + [f"k{row[0]}{row[1]}" if rng.random() < 0.9 else 'kz'] for row in rows],
+                          columns=['A', 'B', 'C', 'D', 'Label'])
+        results = run_one_vs_rest(df)
+        self.assertEqual(list(results), df['Label'].unique().tolist())
+        for c, boundaries in results.items():
+            self.assertEqual(boundaries, run(df, positive=c, negative=c))
+        self.assertEqual(run_one_vs_rest(StringIO(df.to_csv(index=False)), ['kz']), {'kz': results['kz']})
+        with self.assertRaises(ValueError):
+            run_one_vs_rest(df, ['missing'])
+
+
+class TestGeneralityIndex(unittest.TestCase):
+    def test_queries_match_pairwise_scan(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            n = rng.randint(1, 4)
+            hypotheses = [[rng.choice(['a', 'b', '?', None]) for _ in range(n)] for _ in range(rng.randint(1, 8))]
+            index = GeneralityIndex(hypotheses)
+            for h in hypotheses:
+                self.assertEqual(index.has_more_general(h), any(is_more_general(h1, h) for h1 in hypotheses))
+                self.assertEqual(index.has_less_general(h), any(is_more_general(h, h1) for h1 in hypotheses))
+
+    def test_remove(self):
+        index = GeneralityIndex()
+        key = index.add(['?', '?'])
+        self.assertTrue(index.has_more_general(['a', '?']))
+        index.remove(key)
+        self.assertFalse(index.has_more_general(['a', '?']))
+        self.assertEqual(len(index), 0)
+
+class TestStreaming(unittest.TestCase):
+    def test_scan_domains(self):
+        self.assertEqual(scan_domains(StringIO(WEATHER_CSV), chunksize=2)[0], ['Sunny', 'Overcast', 'Rain'])
+
+    def test_stream_matches_in_memory(self):
+        for name in ('data.csv', 'driving_behavior.csv'):
+            path = os.path.join(HERE, name)
+            unique_values, S, G = learn_stream(path, chunksize=3)
+            self.assertEqual((S, G), reference_run(path))
+
+    def test_declared_schema(self):
+        schema = {'Outlook': ['Sunny', 'Overcast', 'Rain'], 'Temperature': ['Hot', 'Mild', 'Cool'],
+                  'Humidity': ['High', 'Normal'], 'Wind': ['Weak', 'Strong']}
+        unique_values, S, G = learn_stream(StringIO(WEATHER_CSV), schema=schema, chunksize=2)
+        self.assertEqual(unique_values, list(schema.values()))
+        self.assertEqual((S, G), reference_run(StringIO(WEATHER_CSV)))
+
+    def test_schema_rejects_unknown_values(self):
+        schema = {'Outlook': ['Sunny', 'Rain'], 'Temperature': ['Hot', 'Mild', 'Cool'],
+                  'Humidity': ['High', 'Normal'], 'Wind': ['Weak', 'Strong']}
+        with self.assertRaises(ValueError):
+            learn_stream(StringIO(WEATHER_CSV), schema=schema)
+
+    def test_missing_values_collapse_across_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'missing.csv')
+            with open(path, 'w') as f:
+                f.write("a,b,y\nq,x,Yes\n,y,No\nq,y,Yes\nNA,x,No\nr,x,No\n")
+            domain = scan_domains(path, chunksize=1)[0]
+            self.assertEqual(len(domain), 3)
+            self.assertIs(domain[1], main.NAN)
+            self.assertEqual(domain[::2], ['q', 'r'])
+            unique_values, S, G = learn_stream(path, chunksize=1)
+            self.assertEqual(unique_values, scan_domains(path)[:-1])
+            self.assertEqual((S, G), reference_run(path))
+            schema = {'a': ['q', 'r', float('nan')], 'b': ['x', 'y']}
+            self.assertEqual(learn_stream(path, schema=schema, chunksize=1)[1:], (S, G))
+
+class TestVersionSpace(unittest.TestCase):
+    def test_from_csv_matches_reference(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        version_space = VersionSpace.from_csv(path)
+        self.assertEqual((version_space.S, version_space.G), reference_run(path))
+        self.assertEqual(version_space.n_examples, 4)
+
+    def test_checkpoint_and_resume(self):
+        df = pd.read_csv(os.path.join(HERE, 'data.csv')).head(8)
+        examples = list(extract_examples(df))
+        unique_values = [df[column].unique().tolist() for column in df.columns[:-1]]
+        full = VersionSpace(unique_values)
+        full.update_batch(examples)
+
+        partial = VersionSpace(unique_values)
+        partial.update_batch(examples[:4])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'vs.bin')
+            partial.save(path)
+            resumed = VersionSpace.load(path)
+        self.assertEqual((resumed.S, resumed.G, resumed.n_examples), (partial.S, partial.G, 4))
+        resumed.update_batch(examples[4:])
+        self.assertEqual((resumed.S, resumed.G), (full.S, full.G))
+
+    def test_new_values_extend_domains(self):
+        version_space = VersionSpace([['Sunny'], ['Hot']])
+        version_space.update(['Rain', 'Hot'], True)
+        self.assertEqual(version_space.unique_values, [['Sunny', 'Rain'], ['Hot']])
+        self.assertEqual(version_space.S, [['Rain', 'Hot']])
+
+    def test_new_values_after_specialization_are_rejected(self):
+        version_space = VersionSpace([['Sunny', 'Overcast'], ['Hot']])
+        version_space.update(['Overcast', 'Hot'], False)
+        with self.assertRaises(ValueError):
+            version_space.update(['Rain', 'Cold'], True)
+        self.assertEqual(version_space.unique_values, [['Sunny', 'Overcast'], ['Hot']])
+        full = VersionSpace([['Sunny', 'Overcast', 'Rain'], ['Hot', 'Cold']])
+        full.update_batch([(['Overcast', 'Hot'], False), (['Rain', 'Cold'], True)])
+        self.assertEqual(full.G, [['Rain', '?'], ['?', 'Cold']])
+
+    def test_resume_with_missing_values(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first, second = os.path.join(tmp, 'first.csv'), os.path.join(tmp, 'second.csv')
+            with open(first, 'w') as f:
+                f.write("a,b,y\nq,x,Yes\n,y,No\nq,y,Yes\n")
+            with open(second, 'w') as f:
+                f.write("a,b,y\nNA,x,No\n,y,No\nq,x,Yes\n")
+            version_space = VersionSpace.from_csv(first)
+            version_space.update_csv(second, chunksize=1)
+            self.assertEqual(len(version_space.unique_values[0]), 2)
+            self.assertEqual((version_space.S, version_space.G), ([['q', '?']], [['q', '?']]))
+            checkpoint = os.path.join(tmp, 'vs.bin')
+            VersionSpace.from_csv(first).save(checkpoint)
+            resumed = VersionSpace.load(checkpoint)
+            resumed.update_batch([([float('nan'), 'x'], False)])
+            self.assertIs(resumed.unique_values[0][1], main.NAN)
+            self.assertEqual((resumed.S, resumed.G), ([['q', '?']], [['q', '?']]))
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'not_a_checkpoint.bin')
+            with open(path, 'wb') as f:
+                f.write(b'0123456789')
+            with self.assertRaises(ValueError):
+                VersionSpace.load(path)
+
+class TestBatch(unittest.TestCase):
+    def test_run_validates_indicators(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        self.assertEqual(run(path), reference_run(path))
+        with self.assertRaises(ValueError):
+            run(path, positive='Maybe')
+
+    def test_run_on_dataframe(self):
+        df = pd.read_csv(StringIO(WEATHER_CSV.replace('Yes', 'Play').replace('No', 'Stay')))
+        before = df.copy()
+        self.assertEqual(run(df, positive='Play', negative='Stay'), reference_run(StringIO(WEATHER_CSV)))
+        pd.testing.assert_frame_equal(df, before)
+
+    def test_progress_and_cancel(self):
+        df = pd.read_csv(os.path.join(HERE, 'data.csv'))
+        reports = []
+        run(df, progress=lambda *report: reports.append(report))
+        self.assertEqual(reports, [(14, 0, 0)])
+
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(LearningCancelled) as raised:
+            run(df, cancel=cancel)
+        self.assertEqual(raised.exception.rows_processed, 1)
+
+    def test_gui_worker_reports_through_queue(self):
+        from app import CandidateEliminationGUI
+        df = pd.read_csv(os.path.join(HERE, 'driving_behavior.csv'))
+        messages = queue.Queue()
+        CandidateEliminationGUI.run_worker(df, 'Yes', 'No', messages, threading.Event())
+        self.assertEqual(messages.get_nowait()[0], 'progress')
+        self.assertEqual(messages.get_nowait(), ('done',) + reference_run(os.path.join(HERE, 'driving_behavior.csv')))
+
+    def test_manifest_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'weather.csv'), 'w') as f:
+                f.write(WEATHER_CSV.replace('Yes', 'Play').replace('No', 'Stay'))
+            manifest = os.path.join(tmp, 'manifest.json')
+            with open(manifest, 'w') as f:
+                json.dump([{'path': 'weather.csv', 'positive': 'Play', 'negative': 'Stay'},
+                           {'path': os.path.join(HERE, 'driving_behavior.csv')},
+                           {'path': 'missing.csv'}], f)
+            summary = batch.run_batch(batch.read_manifest(manifest), os.path.join(tmp, 'out'), workers=2)
+            self.assertEqual((summary['succeeded'], summary['failed']), (2, 1))
+            with open(os.path.join(tmp, 'out', 'weather.json')) as f:
+                result = json.load(f)
+        S, G = reference_run(StringIO(WEATHER_CSV))
+        self.assertEqual((result['S'], result['G']), (S, G))
+        self.assertEqual([entry['result'] for entry in summary['files']],
+                         ['weather.json', 'driving_behavior.json', 'missing.json'])
+        self.assertEqual(batch._result_names([{'path': 'a/summary.csv'}, {'path': 'b/summary.csv'}]),
+                         ['summary_2.json', 'summary_3.json'])
+
+class TestCli(unittest.TestCase):
+    def test_label_column_selection(self):
+        df = pd.read_csv(StringIO(WEATHER_CSV))
+        moved = df[['Play'] + list(df.columns[:-1])]
+        features, version_space = cli.learn_file(StringIO(moved.to_csv(index=False)), label_column='Play')
+        self.assertEqual(features, list(df.columns[:-1]))
+        self.assertEqual((version_space.S, version_space.G), reference_run(StringIO(WEATHER_CSV)))
+
+    def test_json_and_binary_output(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        S, G = reference_run(path)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'out.json')
+            binary_path = os.path.join(tmp, 'out.bin')
+            self.assertEqual(cli.main([path, '--output', json_path]), 0)
+            self.assertEqual(cli.main([path, '--format', 'binary', '--output', binary_path]), 0)
+            with open(json_path) as f:
+                result = json.load(f)
+            version_space = VersionSpace.load(binary_path)
+        self.assertEqual((result['S'], result['G']), (S, G))
+        self.assertEqual((version_space.S, version_space.G, version_space.n_examples), (S, G, 4))
+
+    def test_one_vs_rest_output(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'out.json')
+            jsonl_path = os.path.join(tmp, 'out.jsonl')
+            self.assertEqual(cli.main([path, '--one-vs-rest', '--output', json_path]), 0)
+            self.assertEqual(cli.main([path, '--one-vs-rest', '--format', 'jsonl', '--output', jsonl_path]), 0)
+            with open(json_path) as f:
+                result = json.load(f)
+            with open(jsonl_path) as f:
+                lines = [json.loads(line) for line in f]
+        self.assertEqual([entry['class'] for entry in result['classes']], ['Yes', 'No'])
+        self.assertEqual((result['classes'][0]['S'], result['classes'][0]['G']), reference_run(path))
+        self.assertEqual((result['classes'][1]['S'], result['classes'][1]['G']), run(path, 'No', 'Yes'))
+        self.assertEqual(len(lines), sum(len(entry['S']) + len(entry['G']) for entry in result['classes']))
+
+    def test_missing_indicator_fails(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertEqual(cli.main([path, '--positive', 'Maybe', '--output', os.path.join(tmp, 'out.json')]), 1)
+
+class TestPreview(unittest.TestCase):
+    def test_estimate_row_count(self):
+        from app import estimate_row_count
+        self.assertEqual(estimate_row_count(os.path.join(HERE, 'data.csv')), (14, True))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'big.csv')
+            with open(path, 'w') as f:
+                f.write('a,b\n' + 'x,y\n' * 100000)
+            count, exact = estimate_row_count(path, sample_bytes=4096)
+        self.assertFalse(exact)
+        self.assertAlmostEqual(count, 100000, delta=1000)
+
+class TestHistoryStore(unittest.TestCase):
+    def entry(self, name, output):
+        return {'file_name': name, 'positive_indicator': 'Yes', 'negative_indicator': 'No',
+                'display_timestamp': '2024-01-01 00:00:00', 'output': output}
+
+    def test_append_load_and_read_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoryStore(tmp)
+            store.append(self.entry('a.csv', 'Final S: [1]\n'))
+            store.append(self.entry('b.csv', 'Final S: [é]\n'))
+            entries = HistoryStore(tmp).load()
+            self.assertEqual([e['file_name'] for e in entries], ['a.csv', 'b.csv'])
+            self.assertNotIn('output', entries[0])
+            self.assertEqual(store.read_output(entries[1]), 'Final S: [é]\n')
+            store.clear()
+            self.assertEqual(store.load(), [])
+
+    def test_torn_index_line_is_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoryStore(tmp)
+            store.append(self.entry('a.csv', 'out'))
+            with open(store.index_path, 'a', encoding='utf-8') as f:
+                f.write('{"file_name": "b.c')
+            self.assertEqual(len(store.load()), 1)
+            store.append(self.entry('c.csv', 'more'))
+            entries = store.load()
+            self.assertEqual([entry['file_name'] for entry in entries], ['a.csv', 'c.csv'])
+            self.assertEqual(store.read_output(entries[1]), 'more')
+
+    def test_migrates_legacy_history_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'history.json'), 'w', encoding='utf-8') as f:
+                json.dump([self.entry('old.csv', 'old output')], f)
+            store = HistoryStore(tmp)
+            entries = store.load()
+            self.assertEqual(store.read_output(entries[0]), 'old output')
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'history.json')))
+
+class TestResultCache(unittest.TestCase):
+    def test_key_depends_on_content_and_indicators(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'weather.csv')
+            with open(path, 'w') as f:
+                f.write(WEATHER_CSV)
+            key = ResultCache.key(path, 'Yes', 'No')
+            self.assertEqual(key, ResultCache.key(path, 'Yes', 'No'))
+            self.assertNotEqual(key, ResultCache.key(path, 'No', 'Yes'))
+            with open(path, 'a') as f:
+                f.write('Rainy,Cold,High,Strong,No\n')
+            self.assertNotEqual(key, ResultCache.key(path, 'Yes', 'No'))
+
+    def test_lru_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            cache.put('a', [['x', None]], [['?', '?']])
+            entry_size = os.path.getsize(os.path.join(tmp, 'a.json'))
+            cache.max_bytes = 2 * entry_size
+            os.utime(os.path.join(tmp, 'a.json'), (1, 1))
+            cache.put('b', [['y', None]], [['?', '?']])
+            os.utime(os.path.join(tmp, 'b.json'), (2, 2))
+            self.assertEqual(cache.get('a'), ([['x', None]], [['?', '?']]))
+            cache.put('c', [['z', None]], [['?', '?']])
+            self.assertIsNone(cache.get('b'))
+            self.assertIsNotNone(cache.get('a'))
+
+    def test_gui_worker_reuses_cached_result(self):
+        from app import CandidateEliminationGUI
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        expected = reference_run(path)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(tmp)
+            first = queue.Queue()
+            CandidateEliminationGUI.run_worker(path, 'Yes', 'No', first, threading.Event(), cache)
+            self.assertEqual(list(first.queue)[-1], ('done',) + expected)
+            second = queue.Queue()
+            CandidateEliminationGUI.run_worker(path, 'Yes', 'No', second, threading.Event(), cache)
+            self.assertEqual(list(second.queue), [('cache_hit',), ('done',) + expected])
+
+class TestBenchmark(unittest.TestCase):
+    def test_synthetic_dataset_controls(self):
+        df = benchmark.make_synthetic_dataset(2000, 4, 5, positive_ratio=0.5)
+        self.assertEqual(list(df.columns), ['attr0', 'attr1', 'attr2', 'attr3', 'target'])
+        self.assertAlmostEqual((df['target'] == 'Yes').mean(), 0.5, delta=0.05)
+        noisy = benchmark.make_synthetic_dataset(2000, 4, 5, positive_ratio=0.5, noise=0.1)
+        flipped = (noisy['target'] != df['target']).mean()
+        self.assertAlmostEqual(flipped, 0.1, delta=0.03)
+
+    def test_suite_report(self):
+        config = {'name': 'tiny', 'rows': 200, 'attributes': 3, 'cardinality': 3,
+                  'positive_ratio': 0.3, 'noise': 0.0}
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'report.json')
+            report = benchmark.run_suite([config], output)
+            with open(output) as f:
+                self.assertEqual(json.load(f), report)
+        run = report['runs'][0]
+        self.assertEqual(set(run['seconds']), set(benchmark.STAGES))
+        self.assertEqual(set(run['peak_memory_mb']), {'load', 'encode', 'learn'})
+        self.assertEqual((run['S_size'], run['G_size']), (1, 1))
+
+class TestInstrumentation(unittest.TestCase):
+    def test_trace_matches_plain_run(self):
+        originals = {name: getattr(main, name) for name in ('is_consistent', 'trait_negative_hypothesis')}
+        with Instrumentation() as trace:
+            S, G = run(StringIO(WEATHER_CSV))
+        self.assertEqual((S, G), reference_run(StringIO(WEATHER_CSV)))
+        for name, function in originals.items():
+            self.assertIs(getattr(main, name), function)
+        self.assertEqual([row['positive'] for row in trace.rows], [False, False, True, True, True])
+        self.assertEqual((trace.rows[-1]['S_size'], trace.rows[-1]['G_size']), (len(S), len(G)))
+        negative = trace.rows[0]
+        self.assertGreater(negative['generated'], 0)
+        self.assertGreater(negative['is_consistent'], 0)
+        self.assertEqual(trace.calls['trait_negative_hypothesis'], 2)
+
+    def test_export_formats(self):
+        with Instrumentation() as trace:
+            run(StringIO(WEATHER_CSV))
+        with tempfile.TemporaryDirectory() as tmp:
+            trace.export(os.path.join(tmp, 'trace.csv'))
+            trace.export(os.path.join(tmp, 'trace.json'))
+            exported = pd.read_csv(os.path.join(tmp, 'trace.csv'))
+            with open(os.path.join(tmp, 'trace.json')) as f:
+                document = json.load(f)
+        self.assertEqual(len(exported), 5)
+        self.assertEqual(document['summary']['examples'], 5)
+        self.assertEqual(document['summary']['calls']['is_consistent'], trace.calls['is_consistent'])
+
+class TestClassify(unittest.TestCase):
+    def test_matches_per_row_reference(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        unique_values = load_data(path)[1][:-1]
+        S, G = run(path)
+        instances = pd.DataFrame([['Not exists', 'Not exists', 'Relaxed', 'Evening', 'Negative'],
+                                  ['Exists', 'Exists', 'Bored', 'Morning', 'Positive'],
+                                  ['Exists', 'Exists', 'Relaxed', 'Morning', 'Positive'],
+                                  ['Not exists', 'Maybe', 'Relaxed', 'Night', 'Negative']])
+        result = classify(instances, S, G, unique_values)
+        for x, label, vote in zip(instances.values.tolist(), result['label'], result['vote']):
+            covering_S = sum(is_consistent(s, x) for s in S)
+            covering_G = sum(is_consistent(g, x) for g in G)
+            expected = ('positive' if covering_S == len(S) else
+                        'negative' if covering_G == 0 else 'unknown')
+            self.assertEqual(label, expected)
+            self.assertAlmostEqual(vote, (covering_S + covering_G) / (len(S) + len(G)))
+        self.assertEqual(result['label'].tolist(), ['positive', 'negative', 'unknown', 'unknown'])
+
+    def test_collapsed_version_space_and_streams(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        instances = pd.DataFrame([['Sunny', 'Hot', 'High', 'Weak']])
+        unique_values = [['Sunny'], ['Hot'], ['High'], ['Weak']]
+        self.assertEqual(classify(instances, [], [['?'] * 4], unique_values)['label'].tolist(), ['unknown'])
+        version_space = VersionSpace.from_csv(path)
+        chunks = list(classify_csv(path, version_space.S, version_space.G,
+                                   version_space.unique_values, chunksize=3))
+        labels = pd.concat(chunks)['label'].tolist()
+        self.assertEqual(labels, version_space.classify(pd.read_csv(path))['label'].tolist())
+        self.assertEqual(labels, ['positive', 'negative', 'negative', 'positive'])
+
+class TestColumnar(unittest.TestCase):
+    def test_convert_and_learn_match_csv(self):
+        for name in ('data.csv', 'driving_behavior.csv'):
+            path = os.path.join(HERE, name)
+            with tempfile.TemporaryDirectory() as tmp:
+                meta = columnar.convert(path, tmp, chunksize=3)
+                columns, unique_values, codes = columnar.load(tmp)
+                df, expected_values, S, G = load_data(path)
+                self.assertEqual(columns, df.columns)
+                self.assertEqual(unique_values, expected_values)
+                self.assertEqual(meta['rows'], len(df))
+                self.assertEqual(codes[0].dtype, 'uint8')
+                self.assertEqual(columnar.run(tmp), reference_run(path))
+                del codes
+
+    def test_learning_order_and_invalid_directory(self):
+        path = os.path.join(HERE, 'driving_behavior.csv')
+        with tempfile.TemporaryDirectory() as tmp:
+            columnar.convert(path, tmp)
+            order = [3, 2, 1, 0]
+            df = pd.read_csv(path).iloc[order]
+            self.assertEqual(columnar.run(tmp, order=order), run(df))
+            with self.assertRaises(ValueError):
+                columnar.load(os.path.join(tmp, 'missing'))
+
+    def test_columns_are_typed_once_across_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mixed.csv')
+            with open(path, 'w') as f:
+                f.write("a,b,y\n1,1,Yes\n2,01,No\n1,2,Yes\nfoo,,No\n1,NA,Yes\n")
+            converted = os.path.join(tmp, 'mixed.cecols')
+            columnar.convert(path, converted, chunksize=2)
+            columns, unique_values, codes = columnar.load(converted)
+            df, expected_values, S, G = load_data(path)
+            self.assertEqual(unique_values[0], ['1', '2', 'foo'])
+            self.assertEqual(unique_values[0], expected_values[0])
+            self.assertEqual(unique_values[1][:2], [1.0, 2.0])
+            self.assertEqual(codes[1].tolist(), [0, 0, 1, 2, 2])
+            self.assertEqual(columnar.run(converted), run(path))
+            del codes
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        df = benchmark.make_synthetic_dataset(300, n_attributes=4, seed=3)
+        self.examples, self.unique_values = evaluate.load_examples(df)
+
+    def test_cross_validation_matches_serial_runs(self):
+        folds = evaluate.make_folds(len(self.examples), 3, seed=1)
+        self.assertEqual(sorted(i for fold in folds for i in fold), list(range(len(self.examples))))
+        report = evaluate.cross_validate(self.examples, self.unique_values, k=3, seed=1, workers=2)
+        for fold, result in zip(folds, report['fold_results']):
+            train = [e for i, e in enumerate(self.examples) if i not in fold]
+            S, G = [[None] * 4], [['?'] * 4]
+            learn(train, S, G, self.unique_values)
+            instances = pd.DataFrame([self.examples[i][0] for i in fold])
+            labels = classify(instances, S, G, self.unique_values)['label']
+            self.assertEqual({k: result[k] for k in ('rows', 'covered', 'correct')},
+                             evaluate.score(labels, [self.examples[i][1] for i in fold]))
+        # Noise-free data: every covered row is labelled correctly.
+        self.assertEqual(report['rows'], 300)
+        self.assertEqual(report['accuracy'], 1.0)
+        loo = evaluate.leave_one_out(self.examples[:20], self.unique_values, workers=2)
+        self.assertEqual((loo['folds'], loo['rows']), (20, 20))
+        with self.assertRaises(ValueError):
+            evaluate.make_folds(5, 6)
+
+    def test_learning_curve_reuses_prefix(self):
+        sizes = [2, 10, 50, 1000]
+        curve = evaluate.learning_curve(self.examples, self.unique_values, sizes, k=3, workers=2)
+        self.assertEqual([point['size'] for point in curve['points']], sizes)
+        evaluate._init_worker(self.examples, self.unique_values)
+        test = evaluate.make_folds(len(self.examples), 3)[0]
+        incremental = evaluate.evaluate_fold(test, sizes)
+        for size, result in zip(sizes, incremental):
+            self.assertEqual(result, evaluate.evaluate_fold(test, [size])[0])
+        self.assertEqual(incremental[-1]['size'], 200)
+        self.assertEqual(curve['points'][-1]['coverage'], 1.0)
+        self.assertLess(curve['points'][0]['coverage'], 1.0)
+
+
+class TestEncodedEngine(unittest.TestCase):
+    def setUp(self):
+        df = pd.read_csv(StringIO(WEATHER_CSV))
+        self.unique_values = [df[column].unique().tolist() for column in df.columns]
+        self.codebooks = encoded.build_codebooks(self.unique_values)
+
+    def encode(self, h):
+        return encoded.encode_hypothesis(h, self.codebooks)
+
+    def test_round_trip(self):
+        h = ['Sunny', '?', None, 'Weak']
+        self.assertEqual(self.encode(h), (0, encoded.ANY, encoded.EMPTY, 0))
+        self.assertEqual(encoded.decode_hypothesis(self.encode(h), self.unique_values), h)
+
+    def test_predicates_match_reference(self):
+        hypotheses = [['?', 'Hot', '?', '?'], ['Sunny', 'Hot', '?', '?'], ['Sunny', '?', '?', '?'],
+                      [None, None, None, None], ['Sunny', 'Hot', 'High', 'Weak'], ['Rain', None, '?', 'Weak']]
+        for h1 in hypotheses:
+            for h2 in hypotheses:
+                self.assertEqual(encoded.is_more_general(self.encode(h1), self.encode(h2)),
+                                 is_more_general(h1, h2), (h1, h2))
+                self.assertEqual(encoded.is_consistent(self.encode(h1), self.encode(h2)),
+                                 is_consistent(h1, h2), (h1, h2))
+
+    def test_specializations_match_reference(self):
+        h, x = ['?', 'Hot', '?', '?'], ['Sunny', 'Hot', 'High', 'Weak']
+        expected = get_minimal_specializations(h, x, self.unique_values[:-1])
+        result = encoded.get_minimal_specializations(self.encode(h), self.encode(x), self.unique_values[:-1])
+        self.assertEqual([encoded.decode_hypothesis(s, self.unique_values) for s in result], expected)
+
+    def test_run_matches_reference(self):
+        self.assertEqual(encoded.run(StringIO(WEATHER_CSV)), reference_run(StringIO(WEATHER_CSV)))
+        for name in ('data.csv', 'driving_behavior.csv'):
+            path = os.path.join(HERE, name)
+            self.assertEqual(encoded.run(path), reference_run(path))
+
+    def test_random_runs_match_learn(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            n = rng.randint(1, 5)
+            domains = [[f"v{j}" for j in range(rng.randint(1, 4))] for _ in range(n)]
+            data = ','.join(f"a{i}" for i in range(n)) + ',y\n' + ''.join(
+                ','.join(rng.choice(d) for d in domains) + ',' + rng.choice(['Yes', 'No', 'No']) + '\n'
+                for _ in range(rng.randint(1, 12)))
+            df, unique_values, S, G = load_data(StringIO(data))
+            learn(extract_examples(df), S, G, unique_values)
+            self.assertEqual(encoded.run(StringIO(data)), (S, G), data)
+        # Large enough for the indexed pruning of G.
+        data = ','.join(f"a{i}" for i in range(6)) + ',y\n' + ''.join(
+            ','.join(rng.choice('abcd') for _ in range(6)) + ',No\n' for _ in range(3))
+        df, unique_values, S, G = load_data(StringIO(data))
+        learn(extract_examples(df), S, G, unique_values)
+        self.assertGreaterEqual(len(G), main.INDEX_MIN_SIZE)
+        self.assertEqual(encoded.run(StringIO(data)), (S, G))
+
+class TestBitsetEngine(unittest.TestCase):
+    def setUp(self):
+        df = pd.read_csv(StringIO(WEATHER_CSV))
+        self.unique_values = [df[column].unique().tolist() for column in df.columns][:-1]
+        self.codebooks = encoded.build_codebooks(self.unique_values)
+        self.layout = bitset.build_layout(self.unique_values)
+
+    def pack(self, h):
+        return bitset.encode_hypothesis(h, self.codebooks, self.layout)
+
+    def test_round_trip(self):
+        h = ['Sunny', '?', None, 'Weak']
+        self.assertEqual(bitset.decode_hypothesis(self.pack(h), self.unique_values, self.layout), h)
+
+    def test_generality_is_subset(self):
+        self.assertTrue(bitset.is_more_general(self.pack(['?', 'Hot', '?', '?']), self.pack(['Sunny', 'Hot', '?', '?'])))
+        self.assertFalse(bitset.is_more_general(self.pack(['Sunny', '?', '?', '?']), self.pack(['?', 'Hot', '?', '?'])))
+        self.assertFalse(bitset.is_more_general(self.pack(['Sunny', '?', '?', '?']), self.pack(['Sunny', '?', '?', '?'])))
+        self.assertTrue(bitset.is_consistent(self.pack(['Sunny', '?', 'High', 'Weak']), self.pack(['Sunny', 'Hot', 'High', 'Weak'])))
+        self.assertFalse(bitset.is_consistent(self.pack(['Sunny', 'Hot', 'High', 'Weak']), self.pack(['Rain', 'Hot', 'High', 'Weak'])))
+
+    def test_minimal_generalization(self):
+        h, x = self.pack(['Sunny', 'Hot', 'High', 'Weak']), self.pack(['Rain', 'Hot', 'High', 'Weak'])
+        result = bitset.get_minimal_generalizations(h, x, self.layout)
+        self.assertEqual(bitset.decode_hypothesis(result[0], self.unique_values, self.layout), ['?', 'Hot', 'High', 'Weak'])
+
+    def test_remove_less_general_matches_main(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            G = [[rng.choice([*values, '?', '?']) for values in self.unique_values]
+                 for _ in range(rng.randint(1, 40))]
+            if rng.random() < 0.2:
+                G.append([rng.choice([*values, None]) for values in self.unique_values])
+            packed = bitset.remove_less_general([self.pack(g) for g in G], self.layout)
+            self.assertEqual(packed, [self.pack(g) for g in main.remove_less_general(G)])
+
+    def test_run_matches_reference(self):
+        self.assertEqual(bitset.run(StringIO(WEATHER_CSV)), reference_run(StringIO(WEATHER_CSV)))
+        for name in ('data.csv', 'driving_behavior.csv'):
+            path = os.path.join(HERE, name)
+            self.assertEqual(bitset.run(path), reference_run(path))
+
+    def test_random_runs_match_reference(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            n = rng.randint(1, 4)
+            domains = [[f"v{j}" for j in range(rng.randint(1, 3))] for _ in range(n)]
+            data = ','.join(f"a{i}" for i in range(n)) + ',y\n' + ''.join(
+                ','.join(rng.choice(d) for d in domains) + ',' + rng.choice(['Yes', 'No']) + '\n'
+                for _ in range(rng.randint(1, 8)))
+            self.assertEqual(bitset.run(StringIO(data)), reference_run(StringIO(data)), data)
+        data = "a0,a1,y\nv1,v0,Yes\nv1,v1,Yes\nv0,v0,No\nv1,v0,No\nv0,v0,No\n"
+        self.assertEqual(bitset.run(StringIO(data)), reference_run(StringIO(data)))
+
 if __name__ == '__main__':
     unittest.main()
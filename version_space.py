@@ -0,0 +1,221 @@
+"""
+Persistent, incrementally trained version space.
+
+A VersionSpace holds S, G and the attribute domains, learns from new examples
+as they arrive, and can be checkpointed to a compact binary file and resumed
+later, so new data is processed without re-learning the whole history.
+"""
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+import encoded
+from main import (
+    boundary_to_list, canonical_missing, extract_examples, load_data, make_boundary,
+    trait_negative_hypothesis, trait_positive_hypothesis
+)
+
+# Checkpoint layout: magic, format version, metadata length, JSON metadata,
+# then the zlib-compressed S and G hypotheses as int32 value codes.
+MAGIC = b'CEVS'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sBI')
+
+
+class VersionSpace:
+    """Specific and general boundaries of a version space, with the attribute domains"""
+
+    def __init__(self, unique_values, S=None, G=None, positive='Yes', n_examples=0):
+        """
+        Args:
+            unique_values (list): List of unique values for each feature.
+            S (list, optional): The specific hypotheses; defaults to S0.
+            G (list, optional): The general hypotheses; defaults to G0.
+            positive: The target value marking a positive example.
+            n_examples (int): Number of examples already learned.
+        """
+        # Missing values are keyed by main.NAN, whichever loader produced them.
+        self.unique_values = [canonical_missing(values) for values in unique_values]
+        n = len(self.unique_values)
+        self._S = make_boundary([canonical_missing(h) for h in S] if S is not None else [[None] * n])
+        self._G = make_boundary([canonical_missing(h) for h in G] if G is not None else [['?'] * n])
+        self.positive = positive
+        self.n_examples = n_examples
+        self._codebooks = encoded.build_codebooks(self.unique_values)
+
+    @property
+    def S(self):
+        """list: The specific boundary, as list-based hypotheses."""
+        return boundary_to_list(self._S)
+
+    @property
+    def G(self):
+        """list: The general boundary, as list-based hypotheses."""
+        return boundary_to_list(self._G)
+
+    @classmethod
+    def from_csv(cls, data_path, positive='Yes'):
+        """
+        Learns a version space from a whole CSV file.
+
+        Args:
+            data_path (str): The path to the CSV file.
+            positive: The target value marking a positive example.
+
+        Returns:
+            VersionSpace: The trained version space.
+        """
+        df, unique_values, S, G = load_data(data_path)
+        version_space = cls(unique_values[:-1], S, G, positive)
+        version_space.update_batch(extract_examples(df, positive))
+        return version_space
+
+    def _extend_domains(self, row):
+        """
+        Appends values not seen so far to the attribute domains.
+
+        The specializations of G enumerate the domains, so a value that
+        arrives after a negative example has specialized G would be missing
+        from them; such rows are rejected instead.
+        """
+        unseen = [(i, value) for i, (book, value) in enumerate(zip(self._codebooks, row))
+                  if value not in book]
+        if not unseen:
+            return
+        n = len(self.unique_values)
+        if self._G and self._G != make_boundary([['?'] * n]):
+            raise ValueError(f"Values not in the domains of a specialized version space: {unseen}")
+        for i, value in unseen:
+            self._codebooks[i][value] = len(self.unique_values[i])
+            self.unique_values[i].append(value)
+
+    def update(self, row, positive):
+        """
+        Learns a single example.
+
+        Args:
+            row (list): The feature values of the example.
+            positive (bool): Whether the example is positive.
+
+        Raises:
+            ValueError: If the row has the wrong length, or holds a value
+                outside the domains once G has been specialized; resuming
+                such data needs the full domains up front.
+        """
+        row = canonical_missing(row)
+        if len(row) != len(self.unique_values):
+            raise ValueError(f"Expected {len(self.unique_values)} features, got {len(row)}")
+        self._extend_domains(row)
+        if positive:
+            trait_positive_hypothesis(row, self._S, self._G)
+        else:
+            trait_negative_hypothesis(row, self._S, self._G, self.unique_values)
+        self.n_examples += 1
+
+    def update_batch(self, examples):
+        """
+        Learns a batch of examples.
+
+        Args:
+            examples (iterable): (row, is_positive) pairs, as from main.extract_examples.
+        """
+        for row, positive in examples:
+            self.update(row, positive)
+
+    def update_dataframe(self, df):
+        """
+        Learns every row of a DataFrame whose last column is the target.
+
+        Args:
+            df (pandas.DataFrame): The new data.
+        """
+        self.update_batch(extract_examples(df, self.positive))
+
+    def update_csv(self, data_path, chunksize=100_000, skip_rows=0):
+        """
+        Learns the rows of a CSV file, reading it in chunks.
+
+        Args:
+            data_path (str): The path to the CSV file.
+            chunksize (int): Number of rows read per chunk.
+            skip_rows (int): Number of leading data rows to skip, e.g.
+                self.n_examples when resuming on a file that only grew.
+        """
+        import pandas as pd
+        skip = range(1, skip_rows + 1) if skip_rows else None
+        for chunk in pd.read_csv(data_path, chunksize=chunksize, skiprows=skip):
+            self.update_dataframe(chunk)
+
+    def classify(self, instances):
+        """
+        Labels a batch of unlabeled instances; see classify.classify.
+
+        Args:
+            instances (pandas.DataFrame): The instances, features first.
+
+        Returns:
+            pandas.DataFrame: The 'label' and 'vote' of every instance.
+        """
+        from classify import classify
+        return classify(instances, self.S, self.G, self.unique_values)
+
+    def save(self, path):
+        """
+        Writes a binary checkpoint, replacing any existing file atomically.
+
+        Args:
+            path (str): The checkpoint path.
+        """
+        meta = json.dumps({
+            'unique_values': self.unique_values,
+            'positive': self.positive,
+            'n_examples': self.n_examples,
+            'n_S': len(self._S),
+            'n_G': len(self._G),
+        }, ensure_ascii=False).encode('utf-8')
+        codes = array('i')
+        for h in [*self._S, *self._G]:
+            codes.extend(encoded.encode_hypothesis(h, self._codebooks))
+        if sys.byteorder != 'little':
+            codes.byteswap()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+            f.write(meta)
+            f.write(zlib.compress(codes.tobytes()))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a checkpoint written by save.
+
+        Args:
+            path (str): The checkpoint path.
+
+        Returns:
+            VersionSpace: The restored version space.
+
+        Raises:
+            ValueError: If the file is not a version space checkpoint.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, meta_length = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version space checkpoint")
+        offset = _HEADER.size
+        meta = json.loads(data[offset:offset + meta_length].decode('utf-8'))
+        codes = array('i')
+        codes.frombytes(zlib.decompress(data[offset + meta_length:]))
+        if sys.byteorder != 'little':
+            codes.byteswap()
+        unique_values = meta['unique_values']
+        n = len(unique_values)
+        hypotheses = [encoded.decode_hypothesis(codes[i:i + n], unique_values)
+                      for i in range(0, len(codes), n)] if n else []
+        return cls(unique_values, hypotheses[:meta['n_S']], hypotheses[meta['n_S']:],
+                   meta['positive'], meta['n_examples'])